@@ -3,11 +3,48 @@ from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
 import subprocess
+import threading
+import queue
 import time
 import os
 import sys
 import math
 import numpy as np
+from producers import check_exit, parse_lane_step, parse_step, producer_command, producer_path
+from shm_ring import stream_steps
+from trace_overview import TraceOverview
+from trace_server import iter_trace
+from trace_steps import TraceSteps
+
+# Altura da faixa de visão geral do trace, logo abaixo da barra de menu
+OVERVIEW_HEIGHT = 40
+
+# Tempo máximo por quadro gasto recebendo blocos de um trace em carregamento,
+# e quantos valores são acrescentados de cada vez (blocos grandes são fatiados)
+LOAD_BUDGET = 0.01
+LOAD_CHUNK_VALUES = 1 << 18
+# Linhas do stdout de um produtor convertidas em passos de cada vez
+LOAD_CHUNK_LINES = 64
+
+# Threads dos produtores paralelos e cores de cada worker
+PARALLEL_THREADS = 4
+WORKER_COLORS = [
+    (0.20, 0.45, 0.85),  # azul
+    (0.90, 0.45, 0.10),  # laranja
+    (0.20, 0.65, 0.30),  # verde
+    (0.80, 0.20, 0.25),  # vermelho
+    (0.55, 0.35, 0.75),  # roxo
+    (0.10, 0.65, 0.65),  # ciano
+    (0.85, 0.70, 0.10),  # amarelo
+    (0.55, 0.40, 0.25),  # marrom
+]
+
+# Eventos que exigem redesenhar mesmo sem mudança de estado (janela exposta)
+REDRAW_EVENTS = {VIDEOEXPOSE} | {getattr(pygame, name) for name in ("WINDOWEXPOSED", "WINDOWSHOWN", "WINDOWRESTORED")
+                                 if hasattr(pygame, name)}
+
+# Textura da visão geral (recriada apenas quando o trace muda)
+overview_texture = {'id': None, 'overview': None, 'version': None}
 
 class SoundManager:
     def __init__(self):
@@ -134,17 +171,21 @@ class SoundManager:
         sound = self.create_tone(frequency, 0.05)
         sound.play()
 
-def draw_bar(x, height):
+def draw_bar(x, height, color=None):
     w = 0.5  # largura
     d = 0.5  # profundidade
     h = height
 
-    # Gradiente de roxo → laranja
-    max_height = 40.0
-    factor = min(1.0, height / max_height)
-    r = 0.5 + 0.5 * factor
-    g = 0.0 + 0.5 * factor
-    b = 0.5 - 0.5 * factor
+    if color is not None:
+        # Cor do worker dono da posição (produtores paralelos)
+        r, g, b = color
+    else:
+        # Gradiente de roxo → laranja
+        max_height = 40.0
+        factor = min(1.0, height / max_height)
+        r = 0.5 + 0.5 * factor
+        g = 0.0 + 0.5 * factor
+        b = 0.5 - 0.5 * factor
 
     vertices = [
         [x - w, 0, -d],  # 0
@@ -188,6 +229,169 @@ def draw_bar(x, height):
             glVertex3fv(vertices[vertex])
     glEnd()
 
+class BarMesh:
+    """Barras guardadas em buffers da GPU (VBOs)
+    
+    A geometria é enviada uma vez por trace; a cada passo só os vértices e
+    cores das posições que mudaram são reenviados com glBufferSubData. As
+    posições vêm de TraceSteps.changes, sem comparar o array inteiro.
+    """
+    SPACING = 1.5
+    MAX_BAR_HEIGHT = 30
+    
+    # Os 8 cantos de uma barra, na mesma ordem de draw_bar
+    CORNER_X = np.array([-0.5, 0.5, 0.5, -0.5, -0.5, 0.5, 0.5, -0.5], dtype=np.float32)
+    CORNER_TOP = np.array([0, 0, 1, 1, 0, 0, 1, 1], dtype=np.float32)
+    CORNER_Z = np.array([-0.5, -0.5, -0.5, -0.5, 0.5, 0.5, 0.5, 0.5], dtype=np.float32)
+    FACES = np.array([0, 1, 2, 3, 4, 5, 6, 7, 0, 4, 7, 3, 1, 5, 6, 2, 3, 2, 6, 7, 0, 1, 5, 4], dtype=np.uint32)
+    EDGES = np.array([0, 1, 1, 2, 2, 3, 3, 0, 4, 5, 5, 6, 6, 7, 7, 4, 0, 4, 1, 5, 2, 6, 3, 7], dtype=np.uint32)
+    
+    # Acima deste número de trechos contíguos, um único envio cobre todos
+    MAX_UPLOAD_RUNS = 32
+    
+    def __init__(self):
+        self.vertex_buffer, self.color_buffer, self.face_buffer, self.edge_buffer = glGenBuffers(4)
+        self.count = 0
+        self.steps = None
+        self.step = None
+        self.values = None
+        self.owners = None
+        self.uploaded = 0
+    
+    def _geometry(self, indices, values, owners):
+        """Vértices e cores (k x 8 x 3) das barras nas posições dadas"""
+        heights = values * self.scale
+        vertices = np.empty((len(indices), 8, 3), dtype=np.float32)
+        vertices[:, :, 0] = (self.offset + indices * self.SPACING)[:, None] + self.CORNER_X
+        vertices[:, :, 1] = heights[:, None] * self.CORNER_TOP
+        vertices[:, :, 2] = self.CORNER_Z
+        
+        # Gradiente de roxo → laranja, ou a cor do worker dono da posição
+        factor = np.minimum(1.0, heights / 40.0)
+        rgb = np.stack([0.5 + 0.5 * factor, 0.5 * factor, 0.5 - 0.5 * factor], axis=-1)
+        owned = owners >= 0
+        if owned.any():
+            palette = np.array(WORKER_COLORS, dtype=np.float32)
+            rgb[owned] = palette[owners[owned] % len(palette)]
+        colors = np.repeat(rgb[:, None, :], 8, axis=1).astype(np.float32)
+        return vertices, colors
+    
+    def load(self, steps, step):
+        """Recria os buffers para um novo trace, com a normalização fixa"""
+        owners = steps.owner_row(step)
+        self.steps = steps
+        self.step = step
+        self.count = steps.values.shape[1]
+        self.scale = self.MAX_BAR_HEIGHT / steps.max_value
+        self.offset = -self.count * self.SPACING / 2
+        self.values = steps[step].copy()
+        self.owners = owners.astype(np.int64) if owners is not None else np.full(self.count, -1, dtype=np.int64)
+        
+        vertices, colors = self._geometry(np.arange(self.count), self.values, self.owners)
+        base = (np.arange(self.count, dtype=np.uint32) * 8)[:, None]
+        
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glBufferData(GL_ARRAY_BUFFER, vertices, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+        glBufferData(GL_ARRAY_BUFFER, colors, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.face_buffer)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, np.ascontiguousarray(base + self.FACES), GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.edge_buffer)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, np.ascontiguousarray(base + self.EDGES), GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+    
+    def update(self, step):
+        """Reenvia apenas as barras que mudaram; retorna quantas foram enviadas"""
+        # Mesmo passo do quadro anterior (pausado, câmera girando): nada a fazer
+        if step == self.step:
+            return 0
+        
+        new_values = self.steps[step]
+        new_owners = self.steps.owner_row(step)
+        if abs(step - self.step) == 1:
+            # Passo vizinho (reprodução ou setas): mudanças já calculadas no trace
+            changed = self.steps.changes(max(step, self.step))
+        else:
+            # Salto pela visão geral ou reinício: comparar o array inteiro
+            different = new_values != self.values
+            if new_owners is not None:
+                different |= new_owners != self.owners
+            changed = np.flatnonzero(different)
+        self.step = step
+        if changed.size == 0:
+            return 0
+        self.values[changed] = new_values[changed]
+        if new_owners is not None:
+            self.owners[changed] = new_owners[changed]
+        
+        # Trechos contíguos de posições alteradas (uma troca gera dois)
+        runs = np.split(changed, np.flatnonzero(np.diff(changed) != 1) + 1)
+        if len(runs) > self.MAX_UPLOAD_RUNS:
+            runs = [np.arange(changed[0], changed[-1] + 1)]
+        
+        for run in runs:
+            vertices, colors = self._geometry(run, self.values[run], self.owners[run])
+            offset = int(run[0]) * vertices[0].nbytes
+            glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+            glBufferSubData(GL_ARRAY_BUFFER, offset, vertices.nbytes, vertices)
+            glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+            glBufferSubData(GL_ARRAY_BUFFER, offset, colors.nbytes, colors)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        
+        self.uploaded = sum(len(run) for run in runs)
+        return self.uploaded
+    
+    def draw(self):
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        
+        # Faces sólidas coloridas
+        glEnableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+        glColorPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.face_buffer)
+        glDrawElements(GL_QUADS, self.count * len(self.FACES), GL_UNSIGNED_INT, None)
+        glDisableClientState(GL_COLOR_ARRAY)
+        
+        # Bordas pretas
+        glColor3f(0, 0, 0)
+        glLineWidth(1.5)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.edge_buffer)
+        glDrawElements(GL_LINES, self.count * len(self.EDGES), GL_UNSIGNED_INT, None)
+        
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+class RenderStats:
+    """Contadores do loop de renderização: quadros desenhados, pulados e ociosidade"""
+    def __init__(self):
+        self.rendered = 0
+        self.skipped = 0
+        self.idle_wall = 0.0
+        self.idle_cpu = 0.0
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+    
+    def wait_for_events(self):
+        """Bloqueia até o próximo evento, medindo o tempo e a CPU gastos parado"""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        events = [pygame.event.wait()] + pygame.event.get()
+        self.idle_wall += time.perf_counter() - wall
+        self.idle_cpu += time.process_time() - cpu
+        return events
+    
+    def report(self):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        idle_usage = 100 * self.idle_cpu / self.idle_wall if self.idle_wall else 0.0
+        print(f"Quadros desenhados: {self.rendered}, pulados: {self.skipped}")
+        print(f"Tempo ocioso: {self.idle_wall:.1f} s de {wall:.1f} s "
+              f"(CPU ociosa {idle_usage:.1f}%, CPU média {100 * cpu / wall if wall else 0.0:.1f}%)")
+
 def setup_lighting():
     glEnable(GL_LIGHTING)
     glEnable(GL_LIGHT0)
@@ -358,6 +562,28 @@ def draw_text_bitmap(text, x, y, color=(1.0, 1.0, 1.0)):
             "█       ",
             "████████"
         ],
+        'P': [
+            "████████",
+            "█      █",
+            "█      █",
+            "█      █",
+            "████████",
+            "█       ",
+            "█       ",
+            "█       ",
+            "█       "
+        ],
+        'A': [
+            "████████",
+            "█      █",
+            "█      █",
+            "█      █",
+            "████████",
+            "█      █",
+            "█      █",
+            "█      █",
+            "█      █"
+        ],
         'K': [
             "█      █",
             "█     █ ",
@@ -412,7 +638,49 @@ def is_point_in_bounds(point_x, point_y, bounds):
     return (bounds['x'] <= point_x <= bounds['x'] + bounds['width'] and
             bounds['y'] <= point_y <= bounds['y'] + bounds['height'])
 
-def draw_menu_bar(display_width, display_height, active_algorithm):
+def draw_trace_overview(overview, display_width, top, current_step):
+    """Desenha a faixa passo x índice com a posição atual da reprodução"""
+    # Reenviar a textura apenas quando a visão geral mudou
+    if overview_texture['id'] is None:
+        overview_texture['id'] = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, overview_texture['id'])
+    if overview_texture['overview'] is not overview or overview_texture['version'] != overview.version:
+        image = overview.image()
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, image.shape[1], image.shape[0], 0,
+                     GL_RGB, GL_UNSIGNED_BYTE, image)
+        overview_texture['overview'] = overview
+        overview_texture['version'] = overview.version
+    
+    glEnable(GL_TEXTURE_2D)
+    glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_REPLACE)
+    glBegin(GL_QUADS)
+    glTexCoord2f(0, 0)
+    glVertex2f(0, top)
+    glTexCoord2f(1, 0)
+    glVertex2f(display_width, top)
+    glTexCoord2f(1, 1)
+    glVertex2f(display_width, top + OVERVIEW_HEIGHT)
+    glTexCoord2f(0, 1)
+    glVertex2f(0, top + OVERVIEW_HEIGHT)
+    glEnd()
+    glDisable(GL_TEXTURE_2D)
+    
+    # Marcador do passo atual
+    if overview.total_steps > 0:
+        marker_x = (current_step + 0.5) / overview.total_steps * display_width
+        glColor4f(1.0, 1.0, 1.0, 1.0)
+        glLineWidth(2.0)
+        glBegin(GL_LINES)
+        glVertex2f(marker_x, top)
+        glVertex2f(marker_x, top + OVERVIEW_HEIGHT)
+        glEnd()
+
+def draw_menu_bar(display_width, display_height, active_algorithm, overview=None, current_step=0, parallel=False):
     """Desenha a barra de menu estática no topo da tela"""
     # Salvar o estado atual da matriz
     glPushMatrix()
@@ -452,6 +720,10 @@ def draw_menu_bar(display_width, display_height, active_algorithm):
     glVertex2f(display_width, menu_height)
     glEnd()
     
+    # Visão geral do trace logo abaixo do menu
+    if overview is not None:
+        draw_trace_overview(overview, display_width, menu_height, current_step)
+    
     # Posições dos textos - reorganizadas para incluir Quick Sort
     bubble_text_x = 50
     bubble_text_y = 30
@@ -501,6 +773,10 @@ def draw_menu_bar(display_width, display_height, active_algorithm):
     quick_color = (0.4, 0.2, 0.6) if active_algorithm == "quick" else (0.6, 0.4, 0.8)
     draw_text_bitmap("QUICK SORT", quick_text_x, quick_text_y, quick_color)
     
+    # Indicador dos produtores paralelos (tecla P)
+    if parallel:
+        draw_text_bitmap("PARALLEL", 720, 30, (0.2, 0.45, 0.85))
+    
     # Restaurar configurações
     glDisable(GL_BLEND)
     glEnable(GL_DEPTH_TEST)
@@ -512,13 +788,17 @@ def draw_menu_bar(display_width, display_height, active_algorithm):
     glPopMatrix()
     
     # Retornar os bounds para detecção de clique
-    return {
+    bounds = {
         'bubble': get_text_bounds("BUBBLE SORT", bubble_text_x, bubble_text_y),
         'merge': get_text_bounds("MERGE SORT", merge_text_x, merge_text_y),
         'quick': get_text_bounds("QUICK SORT", quick_text_x, quick_text_y)
     }
+    if overview is not None:
+        bounds['overview'] = {'x': 0, 'y': menu_height, 'width': display_width, 'height': OVERVIEW_HEIGHT}
+    return bounds
 
-def draw_scene(values, camera_angle_x, camera_angle_y, camera_distance, display_size, active_algorithm):
+def draw_scene(values, camera_angle_x, camera_angle_y, camera_distance, display_size, active_algorithm,
+               overview=None, current_step=0, owners=None, bar_mesh=None):
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
     
     # Desenhar a visualização 3D
@@ -536,64 +816,203 @@ def draw_scene(values, camera_angle_x, camera_angle_y, camera_distance, display_
     
     setup_lighting()
     
-    spacing = 1.5
-    max_height = max(values) if values else 1
-    offset = -len(values) * spacing / 2
-    
-    for i, v in enumerate(values):
-        height = (v / max_height) * 30
-        draw_bar(offset + i * spacing, height)
+    if bar_mesh is not None:
+        bar_mesh.update(current_step)
+        bar_mesh.draw()
+    else:
+        spacing = 1.5
+        max_height = values.max() if len(values) else 1
+        offset = -len(values) * spacing / 2
+        
+        for i, v in enumerate(values):
+            height = (v / max_height) * 30
+            color = WORKER_COLORS[owners[i] % len(WORKER_COLORS)] if owners is not None and owners[i] >= 0 else None
+            draw_bar(offset + i * spacing, height, color)
     
     # Desenhar a barra de menu por último (sobreposta) e retornar bounds
-    menu_bounds = draw_menu_bar(display_size[0], display_size[1], active_algorithm)
+    menu_bounds = draw_menu_bar(display_size[0], display_size[1], active_algorithm, overview, current_step,
+                                owners is not None)
     
     pygame.display.flip()
     
     return menu_bounds
 
-def run_visualizer(algorithm="bubble"):
-    print(f"Tentando executar {algorithm}_sort.exe...")
+def stdout_chunks(command):
+    """Gera as linhas do stdout do produtor em lotes, sem esperar por ele
     
-    if algorithm == "bubble":
-        exe_name = 'bubble_sort.exe' if sys.platform == 'win32' else './bubble_sort'
-    elif algorithm == "merge":
-        exe_name = 'merge_sort.exe' if sys.platform == 'win32' else './merge_sort'
-    elif algorithm == "quick":
-        exe_name = 'quick_sort.exe' if sys.platform == 'win32' else './quick_sort'
-    else:
-        print(f"Algoritmo '{algorithm}' não reconhecido!")
-        return generate_test_data()
+    Uma thread lê o stdout e entrega as linhas numa fila; enquanto nada novo
+    chegou o gerador produz um lote vazio, e o TraceLoader volta ao loop de
+    renderização. Ao ser fechado encerra o produtor; no fim falha se ele
+    terminou com erro.
+    """
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    lines = queue.Queue()
     
-    try:
-        if not os.path.exists(exe_name):
-            print(f"ERRO: {exe_name} não encontrado!")
-            return generate_test_data()
-        
-        proc = subprocess.Popen([exe_name], stdout=subprocess.PIPE, text=True)
-        steps = []
-        
-        print(f"Lendo saída do programa {algorithm} sort...")
+    def read():
         for line in proc.stdout:
-            try:
-                step = list(map(int, line.strip().split()))
-                if step:
-                    steps.append(step)
-                    print(f"Passo lido: {step[:5]}{'...' if len(step) > 5 else ''}")
-            except ValueError as e:
-                print(f"Erro ao ler linha: {line.strip()} - {e}")
+            lines.put(line)
+        lines.put(None)
+    
+    threading.Thread(target=read, daemon=True).start()
+    try:
+        finished = False
+        while not finished:
+            chunk = []
+            while len(chunk) < LOAD_CHUNK_LINES:
+                try:
+                    line = lines.get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    finished = True
+                    break
+                chunk.append(line)
+            yield chunk
+        check_exit(proc, command)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+def shared_memory_blocks(exe_name):
+    """Gera os passos pelo ring buffer em memória compartilhada, bloco a bloco"""
+    ring_info = {}
+    for block in stream_steps([exe_name], ring_info=ring_info):
+        yield block, None
+    if ring_info.get('dropped'):
+        print(f"Passos descartados pelo produtor: {ring_info['dropped']}")
+
+def parallel_blocks(algorithm, threads=PARALLEL_THREADS):
+    """Executa a versão paralela e gera os passos com o dono de cada posição"""
+    exe_name = producer_path(f"parallel_{algorithm}")
+    if exe_name is None or not os.path.exists(exe_name):
+        print(f"Versão paralela de {algorithm} sort não encontrada, usando a sequencial...")
+        return
+    
+    command = producer_command(f"parallel_{algorithm}", 50, int(time.time()), "random", threads)
+    current_owners = None
+    for lines in stdout_chunks(command):
+        parsed = [step for step in map(parse_lane_step, lines) if step is not None]
+        if not parsed:
+            yield None
+            continue
+        # Cada passo marca o trecho processado com o worker que o processou
+        values = np.array([step for lane, step in parsed], dtype=np.int32)
+        owners = np.empty(values.shape, dtype=np.int16)
+        if current_owners is None:
+            current_owners = np.full(values.shape[1], -1, dtype=np.int16)
+        for index, ((worker, timestamp, left, right), step) in enumerate(parsed):
+            current_owners[left:right + 1] = worker
+            owners[index] = current_owners
+        yield values, owners
+
+def server_blocks(server_address, algorithm):
+    """Recebe os passos do servidor de traces (trace_server.py) à medida que chegam"""
+    for block in iter_trace(server_address, algorithm):
+        yield block, None
+
+def pipe_blocks(algorithm):
+    """Lê os passos pelo stdout do produtor à medida que chegam"""
+    exe_name = producer_path(algorithm)
+    if exe_name is None or not os.path.exists(exe_name):
+        print(f"ERRO: executável de {algorithm} sort não encontrado!")
+        return
+    
+    for lines in stdout_chunks([exe_name]):
+        steps = [step for step in map(parse_step, lines) if step is not None]
+        yield (np.array(steps, dtype=np.int32), None) if steps else None
+
+def test_blocks():
+    """Dados de teste, quando nenhum produtor entregou passos"""
+    yield np.array(generate_test_data(), dtype=np.int32), None
+
+class TraceLoader:
+    """Carrega um trace em blocos sem travar o loop de renderização
+    
+    As fontes são tentadas em ordem; se uma falhar, os passos parciais são
+    descartados e a próxima assume. A cada quadro pump() acrescenta os blocos
+    recebidos dentro do orçamento de tempo, e os passos e a visão geral
+    parciais já podem ser desenhados. Uma fonte gera None quando ainda não
+    tem passos prontos, e pump() devolve o controle ao loop de renderização.
+    """
+    def __init__(self, sources):
+        self.sources = list(sources)
+        self.done = False
+        self.blocks = None
+        self._next_source()
+    
+    def _next_source(self):
+        self.close()
+        self.name, factory = self.sources.pop(0)
+        self.blocks = factory()
+        # Bloco ainda não acrescentado por inteiro e quantos passos dele já foram
+        self.pending = None
+        self.offset = 0
+        self.steps = TraceSteps()
+        self.overview = TraceOverview()
+    
+    def pump(self, budget=LOAD_BUDGET):
+        """Recebe blocos até esgotar o orçamento; retorna True quando terminar"""
+        deadline = time.perf_counter() + budget
+        while not self.done:
+            if self.pending is not None:
+                # Views do ring continuam válidas até o próximo next()
+                block, owners = self.pending
+                part = slice(self.offset, self.offset + max(1, LOAD_CHUNK_VALUES // block.shape[1]))
+                self.steps.extend(block[part], owners[part] if owners is not None else None)
+                # Visão geral atualizada à medida que os blocos chegam
+                self.overview.extend(block[part])
+                self.offset = part.stop
+                if self.offset >= len(block):
+                    self.pending = None
+                if time.perf_counter() >= deadline:
+                    break
                 continue
-        
-        print(f"Total de passos lidos: {len(steps)}")
-        
-        if not steps:
-            print("Nenhum passo recebido. Gerando dados de teste...")
-            return generate_test_data()
             
-        return steps
+            try:
+                self.pending = next(self.blocks)
+                self.offset = 0
+                if self.pending is None:
+                    break
+            except StopIteration:
+                if len(self.steps) == 0 and self.sources:
+                    print(f"Nenhum passo recebido ({self.name}), tentando a próxima fonte...")
+                    self._next_source()
+                    continue
+                print(f"Total de passos carregados ({self.name}): {len(self.steps)}")
+                self.done = True
+                break
+            except Exception as e:
+                print(f"Erro ao carregar o trace ({self.name}): {e}")
+                if not self.sources:
+                    self.done = True
+                    break
+                print("Tentando a próxima fonte...")
+                self._next_source()
+        return self.done
+    
+    def close(self):
+        """Interrompe a fonte atual (encerra o produtor ou a conexão)"""
+        if self.blocks is not None:
+            self.blocks.close()
+
+def load_trace(algorithm, transport="pipe", parallel=False, server_address=None):
+    """Começa a carregar o trace do algoritmo e retorna o TraceLoader
     
-    except Exception as e:
-        print(f"Erro ao executar {exe_name}: {e}")
-        return generate_test_data()
+    Ordem das fontes: versão paralela (tecla P), servidor de traces, memória
+    compartilhada, o stdout do produtor e, por fim, dados de teste.
+    """
+    sources = []
+    if parallel and algorithm != "bubble":
+        sources.append(("paralelo", lambda: parallel_blocks(algorithm)))
+    if server_address:
+        sources.append(("servidor", lambda: server_blocks(server_address, algorithm)))
+    exe_name = producer_path(algorithm)
+    if transport == "shm" and exe_name is not None and os.path.exists(exe_name):
+        sources.append(("memória compartilhada", lambda: shared_memory_blocks(exe_name)))
+    sources.append(("stdout", lambda: pipe_blocks(algorithm)))
+    sources.append(("dados de teste", test_blocks))
+    return TraceLoader(sources)
 
 def generate_test_data():
     print("Gerando dados de teste para visualização...")
@@ -613,19 +1032,11 @@ def generate_test_data():
     print(f"Gerados {len(steps)} passos de teste")
     return steps
 
-def detect_quicksort_changes(current_data, previous_data, sound_manager):
-    """Detecta mudanças específicas do quicksort e toca sons apropriados"""
-    if not previous_data or len(current_data) != len(previous_data):
-        return
-    
-    max_value = max(current_data) if current_data else 1
-    changes = []
-    
-    # Encontrar todas as posições que mudaram
-    for i in range(len(current_data)):
-        if current_data[i] != previous_data[i]:
-            changes.append(i)
+def detect_quicksort_changes(current_data, previous_data, changes, max_value, sound_manager):
+    """Detecta mudanças específicas do quicksort e toca sons apropriados
     
+    changes são as posições cujo valor mudou entre os dois passos.
+    """
     # Se há exatamente 2 mudanças, provavelmente é uma troca (swap)
     if len(changes) == 2:
         i, j = changes
@@ -645,12 +1056,14 @@ def detect_quicksort_changes(current_data, previous_data, sound_manager):
         # Identificar possível pivot (elemento que pode ter mudado de posição significativamente)
         for i in changes:
             # Se um elemento se moveu muito, pode ser o pivot sendo posicionado
-            old_pos = previous_data.index(current_data[i]) if current_data[i] in previous_data else -1
+            # (a posição antiga de um elemento que se moveu também mudou)
+            old_positions = changes[previous_data[changes] == current_data[i]]
+            old_pos = old_positions[0] if len(old_positions) else -1
             if old_pos != -1 and abs(i - old_pos) > 1:
                 sound_manager.play_quicksort_pivot_sound(current_data[i], max_value)
                 break
 
-def main():
+def main(transport="pipe", server_address=None):
     pygame.init()
     display = (1280, 720)
     pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
@@ -667,12 +1080,22 @@ def main():
     gluPerspective(45, (display[0] / display[1]), 0.1, 500.0)
     glMatrixMode(GL_MODELVIEW)
     
+    # Barras em buffers da GPU quando há suporte a VBOs (OpenGL 1.5)
+    bar_mesh = BarMesh() if bool(glGenBuffers) else None
+    mesh_steps = None
+    
     # Algoritmo ativo (padrão: bubble)
     active_algorithm = "bubble"
     
-    steps = run_visualizer(active_algorithm)
+    parallel = False
+    loader = load_trace(active_algorithm, transport, parallel, server_address)
+    
+    # Esperar só o primeiro bloco: o restante chega com a visualização já rodando
+    while len(loader.steps) == 0 and not loader.pump():
+        pass
+    steps, overview = loader.steps, loader.overview
     
-    if not steps:
+    if len(steps) == 0:
         print("Nenhum dado para visualizar. Saindo.")
         pygame.quit()
         return
@@ -681,6 +1104,7 @@ def main():
     camera_angle_y = 20
     camera_distance = 80
     mouse_dragging = False
+    overview_dragging = False
     last_mouse_pos = None
     menu_bounds = None
     
@@ -688,7 +1112,16 @@ def main():
     current_step = 0
     paused = False
     running = True
-    previous_step_data = None
+    previous_step = None
+    
+    # Estado do último quadro desenhado: sem mudanças, o quadro é pulado e,
+    # sem reprodução em andamento, o loop dorme até o próximo evento
+    render_stats = RenderStats()
+    drawn_state = None
+    drawn_steps = None
+    drawn_overview = None
+    force_redraw = True
+    waiting_for_events = False
     
     print("Iniciando visualização...")
     print("Controles:")
@@ -697,15 +1130,21 @@ def main():
     print("- Roda do mouse para zoom in/out")
     print("- Espaço para pausar/continuar")
     print("- Setas para avançar/retroceder passos")
+    print("- Clique/arraste na faixa de visão geral para navegar no trace")
     print("- R para reiniciar")
+    print("- P para alternar as versões paralelas (merge/quick)")
     print("- M para ligar/desligar som")
+    print("- I para mostrar estatísticas de renderização")
     print("- +/- para ajustar volume")
     print("- ESC para sair")
     
     while running:
-        for event in pygame.event.get():
+        events = render_stats.wait_for_events() if waiting_for_events else pygame.event.get()
+        for event in events:
             if event.type == QUIT:
                 running = False
+            elif event.type in REDRAW_EVENTS:
+                force_redraw = True
             elif event.type == KEYDOWN:
                 if event.key == K_SPACE:
                     paused = not paused
@@ -715,6 +1154,16 @@ def main():
                     current_step += 1
                 elif event.key == K_r:
                     current_step = 0
+                elif event.key == K_p:
+                    parallel = not parallel
+                    print(f"Versões paralelas {'ligadas' if parallel else 'desligadas'}")
+                    if active_algorithm != "bubble":
+                        loader.close()
+                        loader = load_trace(active_algorithm, transport, parallel, server_address)
+                        current_step = 0
+                        previous_step = None
+                elif event.key == K_i:
+                    render_stats.report()
                 elif event.key == K_m:
                     enabled = sound_manager.toggle()
                     print(f"Som {'ligado' if enabled else 'desligado'}")
@@ -736,26 +1185,34 @@ def main():
                             if active_algorithm != "bubble":
                                 print("Trocando para Bubble Sort...")
                                 active_algorithm = "bubble"
-                                steps = run_visualizer(active_algorithm)
+                                loader.close()
+                                loader = load_trace(active_algorithm, transport, parallel, server_address)
                                 current_step = 0
-                                previous_step_data = None
+                                previous_step = None
                         elif is_point_in_bounds(mouse_pos[0], mouse_pos[1], menu_bounds['merge']):
                             if active_algorithm != "merge":
                                 print("Trocando para Merge Sort...")
                                 active_algorithm = "merge"
-                                steps = run_visualizer(active_algorithm)
+                                loader.close()
+                                loader = load_trace(active_algorithm, transport, parallel, server_address)
                                 current_step = 0
-                                previous_step_data = None
+                                previous_step = None
                         elif is_point_in_bounds(mouse_pos[0], mouse_pos[1], menu_bounds['quick']):
                             if active_algorithm != "quick":
                                 print("Trocando para Quick Sort...")
                                 active_algorithm = "quick"
-                                steps = run_visualizer(active_algorithm)
+                                loader.close()
+                                loader = load_trace(active_algorithm, transport, parallel, server_address)
                                 current_step = 0
-                                previous_step_data = None
+                                previous_step = None
+                        elif 'overview' in menu_bounds and is_point_in_bounds(mouse_pos[0], mouse_pos[1], menu_bounds['overview']):
+                            # Clique na visão geral - saltar para o passo
+                            overview_dragging = True
+                            current_step = overview.step_at(mouse_pos[0] / display[0])
+                            previous_step = None
                         else:
                             # Clique fora do menu - iniciar arrastar câmera
-                            if mouse_pos[1] > 100:  # Abaixo da barra de menu
+                            if mouse_pos[1] > 100 + OVERVIEW_HEIGHT:  # Abaixo da barra de menu e da visão geral
                                 mouse_dragging = True
                                 last_mouse_pos = mouse_pos
                     else:
@@ -768,6 +1225,10 @@ def main():
             elif event.type == MOUSEBUTTONUP:
                 if event.button == 1:
                     mouse_dragging = False
+                    overview_dragging = False
+            elif event.type == MOUSEMOTION and overview_dragging:
+                current_step = overview.step_at(pygame.mouse.get_pos()[0] / display[0])
+                previous_step = None
             elif event.type == MOUSEMOTION and mouse_dragging:
                 current_mouse_pos = pygame.mouse.get_pos()
                 dx = current_mouse_pos[0] - last_mouse_pos[0]
@@ -779,70 +1240,110 @@ def main():
                 
                 last_mouse_pos = current_mouse_pos
         
+        # Trace ainda chegando: receber mais blocos neste quadro
+        if not loader.done:
+            loader.pump()
+        if loader.steps is not steps:
+            # Trace novo (troca de algoritmo ou fonte que falhou no meio)
+            steps, overview = loader.steps, loader.overview
+            current_step = 0
+            previous_step = None
+        
         # Verificar se ainda temos dados válidos
-        if not steps:
+        if len(steps) == 0:
+            waiting_for_events = loader.done
             continue
             
         # Detectar mudanças entre passos para tocar sons
         current_data = steps[current_step]
-        if previous_step_data and current_data != previous_step_data:
-            max_value = max(current_data) if current_data else 1
+        current_owners = steps.owner_row(current_step)
+        
+        # Novo trace: recriar os buffers
+        if bar_mesh is not None and mesh_steps is not steps:
+            bar_mesh.load(steps, current_step)
+            mesh_steps = steps
+        
+        # Sons só entre passos vizinhos (não em saltos pela visão geral), com
+        # as posições alteradas já calculadas no trace
+        if previous_step is not None and abs(current_step - previous_step) == 1:
+            previous_data = steps[previous_step]
+            changes = steps.changes(max(current_step, previous_step))
+            # Nos produtores paralelos uma posição pode mudar só de dono
+            changes = changes[current_data[changes] != previous_data[changes]]
+            max_value = steps.max_value
             
             # Detectar mudanças específicas para cada algoritmo
-            if active_algorithm == "bubble":
+            if len(changes) == 0:
+                pass
+            elif active_algorithm == "bubble":
                 # Lógica original para bubble sort
-                for i in range(len(current_data)):
-                    if current_data[i] != previous_step_data[i]:
-                        for j in range(i + 1, len(current_data)):
-                            if (current_data[j] != previous_step_data[j] and 
-                                current_data[i] == previous_step_data[j] and 
-                                current_data[j] == previous_step_data[i]):
-                                sound_manager.play_swap_sound(current_data[i], current_data[j], max_value)
-                                break
+                i = changes[0]
+                for j in changes[1:]:
+                    if (current_data[i] == previous_data[j] and 
+                        current_data[j] == previous_data[i]):
+                        sound_manager.play_swap_sound(current_data[i], current_data[j], max_value)
                         break
             elif active_algorithm == "merge":
                 # Lógica original para merge sort
-                for i in range(len(current_data)):
-                    if current_data[i] != previous_step_data[i]:
-                        sound_manager.play_merge_sound(current_data[i], i, max_value)
+                for i in changes:
+                    sound_manager.play_merge_sound(current_data[i], i, max_value)
             elif active_algorithm == "quick":
                 # Nova lógica específica para quick sort
-                detect_quicksort_changes(current_data, previous_step_data, sound_manager)
+                detect_quicksort_changes(current_data, previous_data, changes, max_value, sound_manager)
 
         # Verificar se chegou ao final - CORREÇÃO AQUI
-        if current_step == len(steps) - 1:
+        if current_step == len(steps) - 1 and loader.done:
             # Verificar se é a primeira vez que chegamos ao final
             if not hasattr(main, 'completion_played'):
                 main.completion_played = {}
             
             # Criar uma chave única para este processo de ordenação
-            array_key = f"{active_algorithm}_{str(current_data)}"
+            array_key = (active_algorithm, current_data.tobytes())
             
             # Se ainda não tocamos o som de conclusão para este array
             if array_key not in main.completion_played:
                 # Verificar se o array está realmente ordenado
-                if current_data == sorted(current_data):
+                if steps.is_sorted(current_step):
                     sound_manager.play_completion_sound()
                     main.completion_played[array_key] = True
                     print(f"Som de conclusão tocado para {active_algorithm}")  # Debug
 
-        menu_bounds = draw_scene(current_data, camera_angle_x, camera_angle_y, camera_distance, display, active_algorithm)
+        # Redesenhar apenas se câmera, passo, algoritmo ou overlay mudaram
+        state = (camera_angle_x, camera_angle_y, camera_distance, current_step, active_algorithm, overview.version)
+        trace_changed = steps is not drawn_steps or overview is not drawn_overview
+        if force_redraw or trace_changed or state != drawn_state:
+            menu_bounds = draw_scene(current_data, camera_angle_x, camera_angle_y, camera_distance, display, active_algorithm,
+                                     overview, current_step, current_owners, bar_mesh)
+            drawn_state = state
+            drawn_steps = steps
+            drawn_overview = overview
+            force_redraw = False
+            render_stats.rendered += 1
+        else:
+            render_stats.skipped += 1
 
-        # IMPORTANTE: Só atualizar previous_step_data depois de todas as verificações
-        if previous_step_data != current_data:
-            previous_step_data = current_data.copy()
+        # IMPORTANTE: Só atualizar previous_step depois de todas as verificações
+        previous_step = current_step
 
-        if not paused and current_step < len(steps) - 1:
+        playing = not paused and current_step < len(steps) - 1
+        if playing:
             current_step += 1
             # Velocidade ajustada baseada no algoritmo
             if active_algorithm == "quick":
                 pygame.time.wait(80)  # Um pouco mais lento para quick sort devido à complexidade sonora
             else:
                 pygame.time.wait(60)  # Velocidade padrão
-
-        clock.tick(60)
+            clock.tick(60)
+        
+        # Pausado ou no último passo, com o trace completo: tudo o mais muda só por eventos
+        waiting_for_events = not playing and loader.done
         
+    loader.close()
+    render_stats.report()
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # --shm: ler os passos por memória compartilhada em vez do stdout
+    # --server ENDEREÇO: receber os passos de um trace_server.py já em execução
+    server_address = sys.argv[sys.argv.index("--server") + 1] if "--server" in sys.argv[:-1] else None
+    main("shm" if "--shm" in sys.argv else "pipe", server_address)
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""Análise empírica de complexidade dos algoritmos de ordenação
+
+Executa cada produtor em modo de estatísticas (SORT_STATS) sobre uma série
+geométrica de tamanhos, várias distribuições de entrada e sementes repetidas,
+em paralelo. Ajusta comparações, trocas, escritas e tempo aos modelos n,
+n log n e n² e grava um relatório (e gráficos, se o matplotlib existir).
+Medições que falham (ex.: estouro de pilha) ficam registradas no relatório e
+fora do ajuste.
+
+Uso: python analyze_complexity.py [--max-size 8192] [--repeats 3] [--output complexity_report]
+"""
+import argparse
+import csv
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from producers import ALGORITHMS, DISTRIBUTIONS, STATS_FIELDS, producer_command, producer_path, read_stats
+
+MODELS = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * np.log2(n),
+    "n²": lambda n: n ** 2,
+}
+
+
+def geometric_sizes(min_size, max_size, factor):
+    sizes = []
+    size = min_size
+    while size <= max_size:
+        sizes.append(int(size))
+        size *= factor
+    return sizes
+
+
+def run_job(job):
+    """Executa uma medição; uma falha vira um ponto sem dados em vez de abortar a análise"""
+    algorithm, distribution, size, seed = job
+    try:
+        return job, read_stats(producer_command(algorithm, size, seed, distribution)), None
+    except (subprocess.CalledProcessError, RuntimeError) as e:
+        return job, None, str(e)
+
+
+def fit_models(sizes, values):
+    """Ajusta y ≈ c·f(n) em escala log para cada modelo
+
+    Retorna (melhor modelo, {modelo: (c, resíduo)}, expoente empírico) ou None
+    quando não há pontos positivos suficientes (ex.: zero trocas).
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    values = np.asarray(values, dtype=float)
+    mask = values > 0
+    if mask.sum() < 2:
+        return None
+
+    log_n = np.log(sizes[mask])
+    log_y = np.log(values[mask])
+    fits = {}
+    for name, model in MODELS.items():
+        ratio = log_y - np.log(model(sizes[mask]))
+        fits[name] = (float(np.exp(ratio.mean())), float(ratio.std()))
+
+    exponent = float(np.polyfit(log_n, log_y, 1)[0])
+    best = min(fits, key=lambda name: fits[name][1])
+    return best, fits, exponent
+
+
+def collect(algorithms, distributions, sizes, repeats, base_seed, jobs):
+    """Executa todas as combinações e retorna (medições, falhas)"""
+    combinations = [(algorithm, distribution, size, base_seed + repeat)
+                    for algorithm in algorithms
+                    for distribution in distributions
+                    for size in sizes
+                    for repeat in range(repeats)]
+
+    rows = []
+    failures = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for done, ((algorithm, distribution, size, seed), stats, error) in enumerate(pool.map(run_job, combinations), 1):
+            point = {'algorithm': algorithm, 'distribution': distribution, 'size': size, 'seed': seed}
+            if error is None:
+                rows.append({**point, **stats})
+            else:
+                failures.append({**point, 'error': error})
+            print(f"\r{done}/{len(combinations)} medições ({len(failures)} falhas)", end="", flush=True)
+    print()
+    return rows, failures
+
+
+def summarize(rows, failures, algorithms, distributions, sizes):
+    """Mediana entre sementes e ajuste por algoritmo x distribuição x métrica
+
+    Um tamanho em que alguma semente falhou fica como NaN e não entra no ajuste.
+    """
+    failed = {(failure['algorithm'], failure['distribution'], failure['size']) for failure in failures}
+    summary = {}
+    for algorithm in algorithms:
+        for distribution in distributions:
+            medians = {}
+            for metric in STATS_FIELDS:
+                medians[metric] = [float(np.median([row[metric] for row in rows
+                                                    if row['algorithm'] == algorithm
+                                                    and row['distribution'] == distribution
+                                                    and row['size'] == size]))
+                                   if (algorithm, distribution, size) not in failed else float("nan")
+                                   for size in sizes]
+            summary[algorithm, distribution] = {
+                metric: (medians[metric], fit_models(sizes, medians[metric])) for metric in STATS_FIELDS
+            }
+    return summary
+
+
+def write_report(path, summary, sizes, repeats, failures):
+    lines = ["# Análise empírica de complexidade", "",
+             f"Tamanhos: {', '.join(map(str, sizes))} — mediana de {repeats} sementes por ponto.", ""]
+
+    for (algorithm, distribution), metrics in summary.items():
+        lines += [f"## {algorithm} sort — {distribution}", "",
+                  "| métrica | melhor modelo | constante | resíduo | expoente |",
+                  "|---|---|---|---|---|"]
+        for metric, (_, fit) in metrics.items():
+            if fit is None:
+                lines.append(f"| {metric} | — | — | — | — |")
+                continue
+            best, fits, exponent = fit
+            constant, residual = fits[best]
+            lines.append(f"| {metric} | {best} | {constant:.4g} | {residual:.3f} | {exponent:.2f} |")
+        lines.append("")
+
+    # Conclusão direta sobre o pivô mediana de três do quick sort
+    quadratic = [distribution for (algorithm, distribution), metrics in summary.items()
+                 if algorithm == "quick" and metrics['comparisons'][1] is not None
+                 and metrics['comparisons'][1][0] == "n²"]
+    if any(algorithm == "quick" for algorithm, _ in summary):
+        lines += ["## Quick sort (mediana de três)", ""]
+        if quadratic:
+            lines.append(f"Comportamento quadrático nas comparações para: {', '.join(quadratic)}.")
+        else:
+            lines.append("Nenhuma distribuição testada levou a comparações quadráticas.")
+        lines.append("")
+
+    if failures:
+        lines += ["## Medições com falha", "",
+                  "Os tamanhos abaixo ficaram fora do ajuste do respectivo algoritmo e distribuição.", "",
+                  "| algoritmo | distribuição | n | semente | erro |",
+                  "|---|---|---|---|---|"]
+        for failure in failures:
+            lines.append(f"| {failure['algorithm']} | {failure['distribution']} | {failure['size']} | "
+                         f"{failure['seed']} | {failure['error']} |")
+        lines.append("")
+
+    with open(path, "w", encoding="utf-8") as report:
+        report.write("\n".join(lines))
+
+
+def write_plots(output, summary, sizes):
+    """Gráficos log-log por algoritmo e métrica (requer matplotlib)"""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib não encontrado - gráficos não gerados")
+        return
+
+    for algorithm in sorted({algorithm for algorithm, _ in summary}):
+        fig, axes = plt.subplots(1, len(STATS_FIELDS), figsize=(5 * len(STATS_FIELDS), 4))
+        for ax, metric in zip(axes, STATS_FIELDS):
+            for (name, distribution), metrics in summary.items():
+                if name != algorithm:
+                    continue
+                values = np.asarray(metrics[metric][0])
+                if (values > 0).any():
+                    ax.loglog(sizes, np.where(values > 0, values, np.nan), marker="o", label=distribution)
+            ax.set_title(f"{algorithm} sort — {metric}")
+            ax.set_xlabel("n")
+            ax.grid(True, which="both", alpha=0.3)
+        axes[0].legend()
+        fig.tight_layout()
+        fig.savefig(os.path.join(output, f"{algorithm}_sort.png"), dpi=100)
+        plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análise empírica de complexidade dos produtores")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=ALGORITHMS)
+    parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=DISTRIBUTIONS)
+    parser.add_argument("--min-size", type=int, default=64)
+    parser.add_argument("--max-size", type=int, default=8192)
+    parser.add_argument("--factor", type=float, default=2.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="complexity_report")
+    args = parser.parse_args()
+
+    missing = [algorithm for algorithm in args.algorithms if not os.path.exists(producer_path(algorithm))]
+    if missing:
+        parser.error(f"executáveis não encontrados: {', '.join(producer_path(a) for a in missing)}")
+
+    # Executáveis antigos não aceitam os argumentos nem reportam SORT_STATS
+    for algorithm in args.algorithms:
+        _, _, error = run_job((algorithm, "random", 8, args.seed))
+        if error is not None:
+            parser.error(f"{producer_path(algorithm)} não pode ser usado: {error}")
+
+    sizes = geometric_sizes(args.min_size, args.max_size, args.factor)
+    rows, failures = collect(args.algorithms, args.distributions, sizes, args.repeats, args.seed, args.jobs)
+    summary = summarize(rows, failures, args.algorithms, args.distributions, sizes)
+
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, "measurements.csv"), "w", newline="") as measurements:
+        writer = csv.DictWriter(measurements, fieldnames=['algorithm', 'distribution', 'size', 'seed', *STATS_FIELDS])
+        writer.writeheader()
+        writer.writerows(rows)
+    write_report(os.path.join(args.output, "report.md"), summary, sizes, args.repeats, failures)
+    write_plots(args.output, summary, sizes)
+    if failures:
+        print(f"{len(failures)} medições falharam (ver relatório)")
+    print(f"Relatório gravado em {os.path.join(args.output, 'report.md')}")
+
+
+if __name__ == "__main__":
+    main()
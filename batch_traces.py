@@ -0,0 +1,131 @@
+"""Geração em lote de traces (algoritmo x tamanho x distribuição x semente)
+
+Os produtores rodam em um pool limitado de processos, sem abrir a interface.
+Cada trace é gravado no formato de trace_store.py e um manifest.json descreve
+o conjunto. Jobs que falham são tentados novamente até --retries vezes.
+
+Uso: python batch_traces.py --sizes 50 200 --seeds 5 --output traces
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from producers import (ALGORITHMS, DISTRIBUTIONS, PARALLEL_ALGORITHMS, producer_command, producer_path,
+                       read_lane_steps, read_stats, read_steps_pipe)
+from shm_ring import read_steps_shm
+from trace_store import save_trace, trace_name, write_manifest
+
+
+def job_label(job):
+    algorithm, size, distribution, seed = job
+    return f"{algorithm} n={size} {distribution} seed={seed}"
+
+
+def generate_trace(job, output, transport, threads):
+    """Executa um job dentro do pool e grava o trace"""
+    algorithm, size, distribution, seed = job
+    start = time.perf_counter()
+
+    if algorithm in PARALLEL_ALGORITHMS:
+        steps, lanes = read_lane_steps(producer_command(algorithm, size, seed, distribution, threads))
+    elif transport == "shm":
+        steps, lanes = read_steps_shm(producer_command(algorithm, size, seed, distribution)), None
+    else:
+        steps, lanes = read_steps_pipe(producer_command(algorithm, size, seed, distribution)), None
+
+    if len(steps) == 0:
+        raise RuntimeError("o produtor não emitiu nenhum passo")
+    # Executáveis antigos ignoram os argumentos e ordenam sempre 50 elementos
+    if len(steps[0]) != size:
+        raise RuntimeError(f"o produtor ordenou {len(steps[0])} elementos em vez de {size} (executável desatualizado?)")
+
+    name = trace_name(algorithm, size, distribution, seed)
+    save_trace(os.path.join(output, name), steps, lanes)
+    return {
+        'algorithm': algorithm,
+        'size': size,
+        'distribution': distribution,
+        'seed': seed,
+        'file': name,
+        'steps': len(steps),
+        'seconds': round(time.perf_counter() - start, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geração em lote de traces dos produtores")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=ALGORITHMS + PARALLEL_ALGORITHMS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[50])
+    parser.add_argument("--distributions", nargs="+", default=["random"], choices=DISTRIBUTIONS)
+    parser.add_argument("--seeds", type=int, default=1, help="número de sementes por combinação")
+    parser.add_argument("--first-seed", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--retries", type=int, default=2)
+    # No Windows o ring em memória compartilhada não existe (ver shm_ring.h)
+    parser.add_argument("--transport", choices=("shm", "pipe"), default="pipe" if sys.platform == 'win32' else "shm")
+    parser.add_argument("--threads", type=int, default=4, help="threads dos produtores paralelos")
+    parser.add_argument("--output", default="traces")
+    args = parser.parse_args()
+
+    missing = [producer_path(algorithm) for algorithm in args.algorithms if not os.path.exists(producer_path(algorithm))]
+    if missing:
+        parser.error(f"executáveis não encontrados: {', '.join(missing)}")
+
+    # Como em analyze_complexity: executáveis antigos não aceitam tamanho,
+    # semente e distribuição nem reportam SORT_STATS
+    for algorithm in args.algorithms:
+        try:
+            read_stats(producer_command(algorithm, 8, args.first_seed, "random", 1 if algorithm in PARALLEL_ALGORITHMS else None))
+        except (subprocess.CalledProcessError, RuntimeError) as e:
+            parser.error(f"{producer_path(algorithm)} não pode ser usado: {e}")
+
+    os.makedirs(args.output, exist_ok=True)
+    jobs = [(algorithm, size, distribution, seed)
+            for algorithm in args.algorithms
+            for size in args.sizes
+            for distribution in args.distributions
+            for seed in range(args.first_seed, args.first_seed + args.seeds)]
+
+    entries = []
+    failures = []
+    attempts = {job: 1 for job in jobs}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        pending = {pool.submit(generate_trace, job, args.output, args.transport, args.threads): job for job in jobs}
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = pending.pop(future)
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    if attempts[job] <= args.retries:
+                        attempts[job] += 1
+                        print(f"Falha em {job_label(job)}: {e} - tentativa {attempts[job]}")
+                        pending[pool.submit(generate_trace, job, args.output, args.transport, args.threads)] = job
+                    else:
+                        failures.append({'job': job_label(job), 'error': str(e), 'attempts': attempts[job]})
+                        print(f"Desistindo de {job_label(job)} após {attempts[job]} tentativas: {e}")
+                    continue
+
+                entry['attempts'] = attempts[job]
+                entries.append(entry)
+                print(f"[{len(entries) + len(failures)}/{len(jobs)}] {job_label(job)}: "
+                      f"{entry['steps']} passos em {entry['seconds']:.2f} s")
+
+    entries.sort(key=lambda entry: (entry['algorithm'], entry['size'], entry['distribution'], entry['seed']))
+    write_manifest(args.output, entries, failures=failures, transport=args.transport)
+
+    elapsed = time.perf_counter() - start
+    busy = sum(entry['seconds'] for entry in entries)
+    print(f"{len(entries)} traces em {elapsed:.2f} s ({busy:.2f} s somados nos workers), {len(failures)} falhas")
+    print(f"Manifest gravado em {os.path.join(args.output, 'manifest.json')}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
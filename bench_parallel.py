@@ -0,0 +1,37 @@
+"""Speedup dos produtores paralelos em relação a merge_sort.c e quick_sort.c
+
+Uso: python bench_parallel.py [tamanho] [repetições] [threads máximas]
+"""
+import os
+import sys
+
+from producers import producer_command, read_stats
+
+
+def best_seconds(command, repeats):
+    return min(read_stats(command)['seconds'] for _ in range(repeats))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    max_threads = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+    thread_counts = [1]
+    while thread_counts[-1] * 2 <= max_threads:
+        thread_counts.append(thread_counts[-1] * 2)
+    if thread_counts[-1] != max_threads:
+        thread_counts.append(max_threads)
+
+    print(f"n = {size}, melhor de {repeats}, {os.cpu_count()} núcleos")
+    for algorithm in ("merge", "quick"):
+        sequential = best_seconds(producer_command(algorithm, size, 1, "random"), repeats)
+        print(f"{algorithm} sort sequencial: {sequential:.3f} s")
+        for threads in thread_counts:
+            command = producer_command(f"parallel_{algorithm}", size, 1, "random", threads)
+            elapsed = best_seconds(command, repeats)
+            print(f"  {threads:3d} threads: {elapsed:.3f} s  speedup {sequential / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
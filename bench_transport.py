@@ -0,0 +1,57 @@
+"""Compara a vazão do stdout (pipe) com o ring buffer em memória compartilhada
+
+Uso: python bench_transport.py [algoritmo] [tamanho] [repetições] [semente]
+
+Os dois transportes ordenam a mesma entrada (semente fixa) e os traces são
+conferidos antes de comparar as vazões.
+"""
+import sys
+import time
+
+import numpy as np
+
+from producers import producer_command, read_steps_pipe
+from shm_ring import read_steps_shm
+
+
+def measure(read_trace, command, repeats):
+    """Retorna (melhor tempo, trace) entre as repetições"""
+    best = None
+    trace = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        trace = read_trace(command)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, trace
+
+
+def main():
+    algorithm = sys.argv[1] if len(sys.argv) > 1 else "merge"
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+    command = producer_command(algorithm, size, seed, "random")
+
+    results = {
+        'pipe': measure(lambda c: np.array(read_steps_pipe(c), dtype=np.int32), command, repeats),
+        'shm': measure(read_steps_shm, command, repeats),
+    }
+
+    if not np.array_equal(results['pipe'][1], results['shm'][1]):
+        sys.exit(f"Os traces do pipe ({len(results['pipe'][1])} passos) e do shm "
+                 f"({len(results['shm'][1])} passos) diferem; comparação abortada")
+
+    print(f"{algorithm} sort, n = {size}, semente {seed}, melhor de {repeats}")
+    for transport, (elapsed, trace) in results.items():
+        steps = len(trace)
+        megabytes = trace.nbytes / (1024 * 1024)
+        print(f"  {transport:5s} {steps:8d} passos  {elapsed:8.3f} s  "
+              f"{steps / elapsed:10.0f} passos/s  {megabytes / elapsed:8.1f} MB/s")
+
+    speedup = results['pipe'][0] / results['shm'][0]
+    print(f"  shm é {speedup:.1f}x mais rápido que o pipe")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,39 +2,56 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <time.h>
+#include "shm_ring.h"
+#include "sort_stats.h"
 
 #define SIZE 50
 
+int array_size = SIZE;
+
 void print_array(int arr[]) 
 {
-    for (int i = 0; i < SIZE; i++)
+    if (stats_mode)
+        return;
+
+    if (ring_active())
+    {
+        ring_push(arr, array_size);
+        return;
+    }
+
+    for (int i = 0; i < array_size; i++)
         printf("%d ", arr[i]);
 
     printf("\n");
 }
 
-int main() 
+int main(int argc, char *argv[]) 
 {
-    int arr[SIZE];
-    srand(time(NULL));
-
-    for (int i = 0; i < SIZE; i++)
-        arr[i] = rand() % 200 + 1;
+    int *arr = setup_input(argc, argv, &array_size);
 
+    ring_open(array_size);
     print_array(arr);
 
-    for (int i = 0; i < SIZE - 1; i++) 
+    for (int i = 0; i < array_size - 1; i++) 
     {
-        for (int j = 0; j < SIZE - i - 1; j++) 
+        for (int j = 0; j < array_size - i - 1; j++) 
         {
+            stat_comparisons++;
             if (arr[j] > arr[j + 1]) 
             {
+                stat_swaps++;
+                stat_writes += 2;
                 int tmp = arr[j];
                 arr[j] = arr[j + 1];
                 arr[j + 1] = tmp;
-                print_array(arr, SIZE);
+                print_array(arr);
             }
         }
     }
+
+    report_stats();
+    ring_close(arr, array_size);
+    free(arr);
     return 0;
 }
\ No newline at end of file
@@ -1,35 +1,48 @@
 #include <time.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include "shm_ring.h"
+#include "sort_stats.h"
 
 #define ARRAY_SIZE 50
 
+int array_size = ARRAY_SIZE;
+
 void print_array(int arr[]);
 void merge_sort(int arr[], int left, int right);
 void merge(int arr[], int left, int middle, int right);
 
-int main(void)
+int main(int argc, char *argv[])
 {
-    int arr[ARRAY_SIZE];
-    int i;
+    int *arr;
 
-    //inicializa seed aleatoria
-    srand(time(NULL));
-
-    //Gera numeros aleatorios no array
-    for (i = 0; i < ARRAY_SIZE; i++)
-        arr[i] = rand() % 200 + 1;
+    //Gera o array (tamanho, seed e distribuicao opcionais)
+    arr = setup_input(argc, argv, &array_size);
 
+    ring_open(array_size);
     print_array(arr);
 
-    merge_sort(arr, 0, ARRAY_SIZE - 1);
+    merge_sort(arr, 0, array_size - 1);
+
+    report_stats();
+    ring_close(arr, array_size);
+    free(arr);
 }
 
 void print_array(int arr[])
 {
     int i;
 
-    for (i = 0; i < ARRAY_SIZE; i++)
+    if (stats_mode)
+        return;
+
+    if (ring_active())
+    {
+        ring_push(arr, array_size);
+        return;
+    }
+
+    for (i = 0; i < array_size; i++)
         printf("%d ", arr[i]);
 
     printf("\n");
@@ -67,6 +80,7 @@ void merge(int arr[], int left, int middle, int right)
     k = left;
     while (i < n1 && j < n2)
     {
+        stat_comparisons++;
         if (L[i] <= R[j])
         {
             arr[k] = L[i];
@@ -77,6 +91,7 @@ void merge(int arr[], int left, int middle, int right)
             arr[k] = R[j];
             j++;
         }
+        stat_writes++;
         k++;
     }
 
@@ -84,6 +99,7 @@ void merge(int arr[], int left, int middle, int right)
     {
         arr[k] = L[i];
         i++;
+        stat_writes++;
         k++;
     }
 
@@ -91,6 +107,7 @@ void merge(int arr[], int left, int middle, int right)
     {
         arr[k] = R[j];
         j++;
+        stat_writes++;
         k++;
     }
 }
\ No newline at end of file
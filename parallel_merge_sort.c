@@ -0,0 +1,114 @@
+/*
+    Merge sort paralelo: cada divisão entrega a metade esquerda a uma nova
+    thread enquanto a atual ordena a direita, até esgotar o número de threads.
+*/
+
+#include <time.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <pthread.h>
+#include "sort_stats.h"
+#include "trace_lanes.h"
+
+#define ARRAY_SIZE 50
+
+int array_size = ARRAY_SIZE;
+int *buffer;
+int next_worker = 1;
+
+typedef struct
+{
+    int *arr;
+    int left;
+    int right;
+    int threads;
+    int worker;
+} MergeTask;
+
+void merge_sort(int arr[], int left, int right, int threads, int worker);
+void merge(int arr[], int left, int middle, int right, int worker);
+void *merge_sort_thread(void *arg);
+
+int main(int argc, char *argv[])
+{
+    int *arr;
+    int threads;
+
+    arr = setup_input(argc, argv, &array_size);
+    threads = read_thread_count(argc, argv);
+    buffer = malloc(array_size * sizeof(int));
+
+    lane_begin();
+    lane_end(arr, array_size, 0, 0, array_size - 1);
+
+    merge_sort(arr, 0, array_size - 1, threads, 0);
+
+    collect_worker_stats(threads);
+    report_stats();
+    free(buffer);
+    free(arr);
+}
+
+void *merge_sort_thread(void *arg)
+{
+    MergeTask *task = arg;
+
+    merge_sort(task->arr, task->left, task->right, task->threads, task->worker);
+    return NULL;
+}
+
+void merge_sort(int arr[], int left, int right, int threads, int worker)
+{
+    if (left < right)
+    {
+        int middle = left + (right - left) / 2;
+
+        if (threads > 1)
+        {
+            // Metade esquerda (e metade das threads) vai para um novo worker
+            pthread_t thread;
+            MergeTask task = { arr, left, middle, threads / 2,
+                               __atomic_fetch_add(&next_worker, 1, __ATOMIC_RELAXED) };
+
+            pthread_create(&thread, NULL, merge_sort_thread, &task);
+            merge_sort(arr, middle + 1, right, threads - threads / 2, worker);
+            pthread_join(thread, NULL);
+        }
+        else
+        {
+            merge_sort(arr, left, middle, 1, worker);
+            merge_sort(arr, middle + 1, right, 1, worker);
+        }
+
+        lane_begin();
+        merge(arr, left, middle, right, worker);
+        lane_end(arr, array_size, worker, left, right);
+    }
+}
+
+// Os trechos de buffer usados por workers diferentes nunca se sobrepõem
+void merge(int arr[], int left, int middle, int right, int worker)
+{
+    int i = left, j = middle + 1, k = left;
+    WorkerStats *stats = &worker_stats[worker];
+
+    while (i <= middle && j <= right)
+    {
+        stats->comparisons++;
+        if (arr[i] <= arr[j])
+            buffer[k++] = arr[i++];
+        else
+            buffer[k++] = arr[j++];
+    }
+
+    while (i <= middle)
+        buffer[k++] = arr[i++];
+
+    while (j <= right)
+        buffer[k++] = arr[j++];
+
+    for (k = left; k <= right; k++)
+        arr[k] = buffer[k];
+
+    stats->writes += right - left + 1;
+}
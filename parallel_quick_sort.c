@@ -0,0 +1,189 @@
+/*
+    Quick sort paralelo: as partições viram tarefas de um pool de threads.
+    Trechos pequenos são ordenados pelo próprio worker, sem nova tarefa.
+    O pivo é escolhido através da mediana de três, como em quick_sort.c
+*/
+
+#include <time.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <pthread.h>
+#include "sort_stats.h"
+#include "trace_lanes.h"
+
+#define ARRAY_SIZE 50
+
+typedef struct
+{
+    int left;
+    int right;
+} Task;
+
+int array_size = ARRAY_SIZE;
+int *arr;
+int cutoff;
+
+// Pilha de tarefas do pool
+Task *tasks;
+int task_count = 0;
+int pending = 0;
+pthread_mutex_t pool_lock = PTHREAD_MUTEX_INITIALIZER;
+pthread_cond_t pool_cond = PTHREAD_COND_INITIALIZER;
+
+void push_task(int left, int right);
+void *pool_worker(void *arg);
+void quick_sort(int left, int right, int worker);
+void swap(int i, int j, int worker);
+int partition(int left, int right, int worker);
+int pick_median_of_three_pivot(int left, int right, int worker);
+
+int main(int argc, char *argv[])
+{
+    pthread_t threads[MAX_WORKERS];
+    int thread_count;
+    int i;
+
+    arr = setup_input(argc, argv, &array_size);
+    thread_count = read_thread_count(argc, argv);
+    tasks = malloc((array_size + 1) * sizeof(Task));
+
+    // Trechos maiores que o cutoff são distribuídos entre os workers
+    cutoff = array_size / (8 * thread_count);
+    if (cutoff < 16)
+        cutoff = 16;
+
+    lane_begin();
+    lane_end(arr, array_size, 0, 0, array_size - 1);
+
+    push_task(0, array_size - 1);
+
+    for (i = 1; i < thread_count; i++)
+        pthread_create(&threads[i], NULL, pool_worker, (void *) (long) i);
+    pool_worker((void *) 0L);
+    for (i = 1; i < thread_count; i++)
+        pthread_join(threads[i], NULL);
+
+    collect_worker_stats(thread_count);
+    report_stats();
+    free(tasks);
+    free(arr);
+}
+
+void push_task(int left, int right)
+{
+    pthread_mutex_lock(&pool_lock);
+    tasks[task_count].left = left;
+    tasks[task_count].right = right;
+    task_count++;
+    pending++;
+    pthread_cond_signal(&pool_cond);
+    pthread_mutex_unlock(&pool_lock);
+}
+
+void *pool_worker(void *arg)
+{
+    int worker = (int) (long) arg;
+    Task task;
+
+    for (;;)
+    {
+        pthread_mutex_lock(&pool_lock);
+        while (task_count == 0 && pending > 0)
+            pthread_cond_wait(&pool_cond, &pool_lock);
+
+        // Nenhuma tarefa na pilha nem em execução: terminou
+        if (pending == 0)
+        {
+            pthread_mutex_unlock(&pool_lock);
+            return NULL;
+        }
+
+        task = tasks[--task_count];
+        pthread_mutex_unlock(&pool_lock);
+
+        quick_sort(task.left, task.right, worker);
+
+        pthread_mutex_lock(&pool_lock);
+        pending--;
+        if (pending == 0)
+            pthread_cond_broadcast(&pool_cond);
+        pthread_mutex_unlock(&pool_lock);
+    }
+}
+
+void quick_sort(int left, int right, int worker)
+{
+    if (left < right)
+    {
+        int index_pivo;
+
+        lane_begin();
+        index_pivo = partition(left, right, worker);
+        lane_end(arr, array_size, worker, left, right);
+
+        if (right - left > cutoff)
+        {
+            if (left < index_pivo - 1)
+                push_task(left, index_pivo - 1);
+            if (index_pivo + 1 < right)
+                push_task(index_pivo + 1, right);
+        }
+        else
+        {
+            quick_sort(left, index_pivo - 1, worker);
+            quick_sort(index_pivo + 1, right, worker);
+        }
+    }
+}
+
+int pick_median_of_three_pivot(int left, int right, int worker)
+{
+    int mid = left + (right - left) / 2;
+
+    int a = arr[left];
+    int b = arr[mid];
+    int c = arr[right];
+
+    // Encontra a mediana de a, b, c
+    worker_stats[worker].comparisons += 3;
+    if ((a > b) != (a > c))
+        return left;
+    else
+        if ((b > a) != (b > c))
+            return mid;
+        else
+            return right;
+}
+
+int partition(int left, int right, int worker)
+{
+    int pivo_index = pick_median_of_three_pivot(left, right, worker);
+    swap(left, pivo_index, worker);
+
+    int pivo = arr[left];
+    int i = left, j;
+
+    for(j = left + 1; j <= right; j++)
+    {
+        worker_stats[worker].comparisons++;
+        if (arr[j] <= pivo)
+        {
+            i++;
+            swap(i, j, worker);
+        }
+    }
+
+    swap(left, i, worker);
+
+    return i;
+}
+
+void swap(int i, int j, int worker)
+{
+    worker_stats[worker].swaps++;
+    worker_stats[worker].writes += 2;
+
+    int temp = arr[i];
+    arr[i] = arr[j];
+    arr[j] = temp;
+}
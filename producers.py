@@ -0,0 +1,111 @@
+"""Localização e execução dos programas de ordenação (produtores de passos)
+
+Os executáveis são compilados a partir das fontes .c na raiz do repositório:
+
+    gcc -O2 -o merge_sort merge_sort.c
+    gcc -O2 -pthread -o parallel_merge_sort parallel_merge_sort.c
+
+(no Windows, com MinGW, a saída é merge_sort.exe etc.). Executáveis antigos,
+de antes de sort_stats.h, ignoram tamanho, semente e distribuição e não
+reportam estatísticas: precisam ser recompilados.
+"""
+import os
+import subprocess
+import sys
+
+ALGORITHMS = ("bubble", "merge", "quick")
+PARALLEL_ALGORITHMS = ("parallel_merge", "parallel_quick")
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few", "nearly")
+STATS_FIELDS = ("comparisons", "swaps", "writes", "seconds")
+
+
+def producer_path(algorithm):
+    """Retorna o caminho do executável do algoritmo, ou None se não for reconhecido"""
+    if algorithm not in ALGORITHMS + PARALLEL_ALGORITHMS:
+        return None
+    return f'{algorithm}_sort.exe' if sys.platform == 'win32' else f'./{algorithm}_sort'
+
+
+def producer_command(algorithm, size=None, seed=None, distribution=None, threads=None):
+    """Monta a linha de comando do produtor (argumentos posicionais opcionais)"""
+    command = [producer_path(algorithm)]
+    for argument in (size, seed, distribution, threads):
+        if argument is None:
+            break
+        command.append(str(argument))
+    return command
+
+
+def check_exit(proc, command):
+    """Aguarda o produtor e falha se ele terminou com erro (ex.: estouro de pilha)
+
+    Sem essa verificação um produtor que morre no meio da ordenação parece
+    ter emitido um trace completo, só que truncado.
+    """
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, command)
+
+
+def parse_step(line):
+    """Passo de uma linha do stdout do produtor, ou None se a linha não for um passo"""
+    try:
+        step = list(map(int, line.split()))
+    except ValueError:
+        return None
+    return step or None
+
+
+def parse_lane_step(line):
+    """Faixa (worker, timestamp, left, right) e passo de uma linha de produtor
+    paralelo (ver trace_lanes.h), ou None se a linha não for um passo"""
+    header, _, values = line.partition("|")
+    try:
+        lane = tuple(map(int, header.split()))
+        step = list(map(int, values.split()))
+    except ValueError:
+        return None
+    if len(lane) != 4 or not step:
+        return None
+    return lane, step
+
+
+def read_steps_pipe(command):
+    """Lê todos os passos impressos no stdout do produtor"""
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    steps = []
+    for line in proc.stdout:
+        step = parse_step(line)
+        if step is not None:
+            steps.append(step)
+    check_exit(proc, command)
+    return steps
+
+
+def read_lane_steps(command):
+    """Lê os passos dos produtores paralelos (ver trace_lanes.h)
+
+    Retorna (passos, faixas), com uma tupla (worker, timestamp, left, right)
+    por passo.
+    """
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    steps = []
+    lanes = []
+    for line in proc.stdout:
+        parsed = parse_lane_step(line)
+        if parsed is not None:
+            lanes.append(parsed[0])
+            steps.append(parsed[1])
+    check_exit(proc, command)
+    return steps, lanes
+
+
+def read_stats(command):
+    """Executa o produtor com SORT_STATS e devolve contadores e tempo de ordenação"""
+    result = subprocess.run(command, env=dict(os.environ, SORT_STATS="1"),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    fields = dict(item.split("=", 1) for item in result.stderr.split() if "=" in item)
+    missing = [name for name in STATS_FIELDS if name not in fields]
+    if missing:
+        raise RuntimeError(f"{command[0]} não reportou {', '.join(missing)} com SORT_STATS "
+                           f"(executável desatualizado? recompile a partir de {os.path.basename(command[0]).split('.')[0]}.c)")
+    return {name: float(fields[name]) for name in STATS_FIELDS}
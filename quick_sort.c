@@ -5,35 +5,49 @@
 #include <time.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include "shm_ring.h"
+#include "sort_stats.h"
 
 #define ARRAY_SIZE 50
 
+int array_size = ARRAY_SIZE;
+
 void print_array(int arr[]);
 void quick_sort(int arr[], int left, int right);
 void swap(int arr[], int i, int j);
 int partition(int arr[], int left, int right);
 int pick_median_of_three_pivot(int arr[], int left, int right);
 
-int main(void)
+int main(int argc, char *argv[])
 {
-    int arr[ARRAY_SIZE];
-    int i;
-
-    srand(time(NULL));
+    int *arr;
 
-    for(i = 0; i < ARRAY_SIZE; i++)
-        arr[i] = rand() % 200 + 1;
+    arr = setup_input(argc, argv, &array_size);
 
+    ring_open(array_size);
     print_array(arr);
 
-    quick_sort(arr, 0, ARRAY_SIZE - 1);
+    quick_sort(arr, 0, array_size - 1);
+
+    report_stats();
+    ring_close(arr, array_size);
+    free(arr);
 }
 
 void print_array(int arr[])
 {
     int i;
 
-    for(i = 0; i < ARRAY_SIZE; i++)
+    if (stats_mode)
+        return;
+
+    if (ring_active())
+    {
+        ring_push(arr, array_size);
+        return;
+    }
+
+    for(i = 0; i < array_size; i++)
         printf("%d ", arr[i]);
 
     printf("\n");
@@ -48,6 +62,7 @@ int pick_median_of_three_pivot(int arr[], int left, int right)
     int c = arr[right];
 
     // Encontra a mediana de a, b, c
+    stat_comparisons += 3;
     if ((a > b) != (a > c))
         return left;
     else 
@@ -67,6 +82,7 @@ int partition(int arr[], int left, int right)
 
     for(j = left + 1; j <= right; j++)
     {
+        stat_comparisons++;
         if (arr[j] <= pivo)
         {
             i++;
@@ -92,6 +108,9 @@ void quick_sort(int arr[], int left, int right)
 
 void swap(int arr[], int i, int j)
 {
+    stat_swaps++;
+    stat_writes += 2;
+
     int temp = arr[i];
     arr[i] = arr[j];
     arr[j] = temp;
@@ -0,0 +1,160 @@
+/*
+    Transporte opcional por memória compartilhada POSIX.
+
+    Quando a variável de ambiente SORT_SHM_RING contém o nome de um segmento
+    criado pelo visualizador (shm_ring.py), cada passo é copiado para um
+    ring buffer de um produtor / um consumidor em vez de ser impresso no
+    stdout. O cabeçalho tem 8 campos de 64 bits (ver RING_* abaixo) seguidos
+    pelos slots, cada um com um snapshot completo do array.
+
+    SORT_SHM_POLICY=drop descarta snapshots quando o visualizador fica para
+    trás (o último é sempre entregue); o padrão é esperar por espaço.
+
+    Se SORT_SHM_RING estiver definida mas o ring não puder ser usado (segmento
+    inexistente, menor que um snapshot, ou build sem memória compartilhada
+    POSIX), o produtor termina com erro em vez de imprimir no stdout, que o
+    visualizador descarta nesse modo.
+*/
+
+#ifndef SHM_RING_H
+#define SHM_RING_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define SHM_RING_MAGIC 0x474E5253LL  /* "SRNG" */
+#define SHM_RING_HEADER_BYTES 64
+
+enum { RING_MAGIC, RING_DATA_BYTES, RING_N, RING_SLOTS,
+       RING_WRITE, RING_READ, RING_DROPPED, RING_STATE };
+enum { RING_WAITING, RING_STREAMING, RING_DONE };
+
+#define RING_OPEN_FAILED 3
+
+static void ring_fail(const char *name, const char *reason)
+{
+    fprintf(stderr, "ring %s: %s\n", name, reason);
+    exit(RING_OPEN_FAILED);
+}
+
+#ifndef _WIN32
+
+#include <fcntl.h>
+#include <sched.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+static long long *ring_header = NULL;
+static int *ring_data = NULL;
+static size_t ring_map_bytes = 0;
+static int ring_drop = 0;
+static int ring_last_dropped = 0;
+
+int ring_open(int n)
+{
+    const char *name = getenv("SORT_SHM_RING");
+    const char *policy = getenv("SORT_SHM_POLICY");
+    struct stat st;
+    void *map;
+    long long slots;
+    int fd;
+
+    if (name == NULL || *name == '\0')
+        return 0;
+
+    fd = shm_open(name, O_RDWR, 0);
+    if (fd < 0)
+        ring_fail(name, "segmento não encontrado");
+
+    if (fstat(fd, &st) < 0 || st.st_size <= SHM_RING_HEADER_BYTES)
+        ring_fail(name, "segmento sem espaço para o cabeçalho");
+
+    map = mmap(NULL, st.st_size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    close(fd);
+    if (map == MAP_FAILED)
+        ring_fail(name, "falha no mmap");
+
+    ring_header = (long long *) map;
+    ring_data = (int *) ((char *) map + SHM_RING_HEADER_BYTES);
+    ring_map_bytes = st.st_size;
+
+    slots = ring_header[RING_DATA_BYTES] / ((long long) n * sizeof(int));
+    if (ring_header[RING_MAGIC] != SHM_RING_MAGIC)
+        ring_fail(name, "cabeçalho inválido");
+    if (slots < 1)
+        ring_fail(name, "segmento menor que um snapshot do array");
+
+    ring_drop = policy != NULL && strcmp(policy, "drop") == 0;
+    ring_header[RING_N] = n;
+    ring_header[RING_SLOTS] = slots;
+    __atomic_store_n(&ring_header[RING_STATE], RING_STREAMING, __ATOMIC_RELEASE);
+
+    return 1;
+}
+
+int ring_active(void)
+{
+    return ring_header != NULL;
+}
+
+void ring_push(const int arr[], int n)
+{
+    long long slots = ring_header[RING_SLOTS];
+    long long w = ring_header[RING_WRITE];
+
+    // Ring cheio: espera o consumidor ou descarta, conforme a política
+    while (w - __atomic_load_n(&ring_header[RING_READ], __ATOMIC_ACQUIRE) >= slots)
+    {
+        if (ring_drop)
+        {
+            __atomic_store_n(&ring_header[RING_DROPPED], ring_header[RING_DROPPED] + 1, __ATOMIC_RELAXED);
+            ring_last_dropped = 1;
+            return;
+        }
+        sched_yield();
+    }
+
+    memcpy(ring_data + (w % slots) * n, arr, n * sizeof(int));
+    __atomic_store_n(&ring_header[RING_WRITE], w + 1, __ATOMIC_RELEASE);
+    ring_last_dropped = 0;
+}
+
+void ring_close(const int arr[], int n)
+{
+    if (ring_header == NULL)
+        return;
+
+    // O estado final nunca é descartado: ele já tinha sido contado como
+    // descartado, mas agora é entregue
+    if (ring_last_dropped)
+    {
+        __atomic_store_n(&ring_header[RING_DROPPED], ring_header[RING_DROPPED] - 1, __ATOMIC_RELAXED);
+        ring_drop = 0;
+        ring_push(arr, n);
+    }
+
+    __atomic_store_n(&ring_header[RING_STATE], RING_DONE, __ATOMIC_RELEASE);
+    munmap(ring_header, ring_map_bytes);
+    ring_header = NULL;
+}
+
+#else
+
+int ring_open(int n)
+{
+    const char *name = getenv("SORT_SHM_RING");
+
+    (void) n;
+    if (name != NULL && *name != '\0')
+        ring_fail(name, "memória compartilhada POSIX indisponível neste build");
+    return 0;
+}
+int ring_active(void) { return 0; }
+void ring_push(const int arr[], int n) { (void) arr; (void) n; }
+void ring_close(const int arr[], int n) { (void) arr; (void) n; }
+
+#endif
+
+#endif
@@ -0,0 +1,131 @@
+"""Lado consumidor do ring buffer em memória compartilhada (ver shm_ring.h)
+
+O visualizador cria o segmento, passa o nome ao produtor por SORT_SHM_RING e
+lê os snapshots diretamente como views NumPy, sem passar pelo stdout.
+"""
+import os
+import subprocess
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from producers import check_exit
+
+HEADER_BYTES = 64
+MAGIC = 0x474E5253  # "SRNG"
+
+# Campos do cabeçalho (int64), na mesma ordem de shm_ring.h
+RING_MAGIC, RING_DATA_BYTES, RING_N, RING_SLOTS, RING_WRITE, RING_READ, RING_DROPPED, RING_STATE = range(8)
+RING_WAITING, RING_STREAMING, RING_DONE = range(3)
+
+DEFAULT_DATA_BYTES = 32 * 1024 * 1024
+
+
+class ShmRing:
+    def __init__(self, data_bytes=DEFAULT_DATA_BYTES):
+        self.shm = shared_memory.SharedMemory(create=True, size=HEADER_BYTES + data_bytes)
+        self.header = np.ndarray((8,), dtype=np.int64, buffer=self.shm.buf)
+        self.header[:] = 0
+        self.header[RING_DATA_BYTES] = data_bytes
+        self.header[RING_MAGIC] = MAGIC
+        self.slots = None
+
+    @property
+    def name(self):
+        """Nome POSIX do segmento, como esperado por shm_open"""
+        return '/' + self.shm.name
+
+    @property
+    def dropped(self):
+        return int(self.header[RING_DROPPED])
+
+    def env(self, policy="block"):
+        """Ambiente para o produtor escrever neste ring"""
+        return dict(os.environ, SORT_SHM_RING=self.name, SORT_SHM_POLICY=policy)
+
+    def done(self):
+        return self.header[RING_STATE] == RING_DONE
+
+    def poll(self):
+        """Retorna views (sem cópia) dos snapshots ainda não lidos, em ordem
+
+        As views continuam válidas apenas até a chamada de release().
+        """
+        if self.slots is None:
+            if self.header[RING_STATE] == RING_WAITING:
+                return []
+            n = int(self.header[RING_N])
+            count = int(self.header[RING_SLOTS])
+            self.slots = np.ndarray((count, n), dtype=np.int32, buffer=self.shm.buf, offset=HEADER_BYTES)
+
+        read = int(self.header[RING_READ])
+        write = int(self.header[RING_WRITE])
+        if write == read:
+            return []
+
+        count = len(self.slots)
+        start = read % count
+        end = start + (write - read)
+        if end <= count:
+            return [self.slots[start:end]]
+        return [self.slots[start:], self.slots[:end - count]]
+
+    def release(self, count):
+        """Devolve ao produtor os slots já consumidos"""
+        self.header[RING_READ] += count
+
+    def close(self):
+        self.header = None
+        self.slots = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+def stream_steps(command, policy="block", data_bytes=DEFAULT_DATA_BYTES, ring_info=None):
+    """Executa o produtor sobre um ring e gera blocos de snapshots (views)
+
+    Cada bloco deve ser copiado antes de pedir o próximo. Se ring_info for um
+    dicionário, recebe o número de snapshots descartados ao final. Um produtor
+    que termina com erro gera CalledProcessError depois do último bloco, e um
+    que não chegou a usar o ring gera RuntimeError.
+    """
+    ring = ShmRing(data_bytes)
+    proc = subprocess.Popen(command, env=ring.env(policy), stdout=subprocess.DEVNULL)
+    try:
+        while True:
+            blocks = ring.poll()
+            if blocks:
+                for block in blocks:
+                    yield block
+                ring.release(sum(len(block) for block in blocks))
+                continue
+
+            # Conferir o estado depois do poll vazio: o produtor publica o
+            # cursor de escrita antes de marcar o fim
+            if ring.done() or proc.poll() is not None:
+                if not ring.poll():
+                    break
+                continue
+
+            time.sleep(0.0002)
+
+        if ring_info is not None:
+            ring_info['dropped'] = ring.dropped
+        check_exit(proc, command)
+        # Produtor antigo, ou que não abriu o ring: o trace foi para o stdout
+        if ring.header[RING_STATE] == RING_WAITING:
+            raise RuntimeError(f"{command[0]} terminou sem escrever no ring {ring.name}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        ring.close()
+
+
+def read_steps_shm(command, policy="block", data_bytes=DEFAULT_DATA_BYTES, ring_info=None):
+    """Lê o trace completo pelo ring, como array (passos x n) de int32"""
+    blocks = [block.copy() for block in stream_steps(command, policy, data_bytes, ring_info)]
+    if not blocks:
+        return np.empty((0, 0), dtype=np.int32)
+    return np.concatenate(blocks)
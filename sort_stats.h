@@ -0,0 +1,99 @@
+/*
+    Entrada e contadores compartilhados pelos programas de ordenação.
+
+    Linha de comando: ./programa [tamanho] [semente] [distribuição]
+    Distribuições: random (padrão), sorted, reversed, few (muitos repetidos)
+    e nearly (ordenado com algumas trocas).
+
+    Com a variável de ambiente SORT_STATS definida os passos não são emitidos
+    e, ao final, os contadores e o tempo de ordenação vão para o stderr.
+*/
+
+#ifndef SORT_STATS_H
+#define SORT_STATS_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+long long stat_comparisons = 0;
+long long stat_swaps = 0;
+long long stat_writes = 0;
+int stats_mode = 0;
+
+static struct timespec stat_start;
+
+void fill_array(int arr[], int n, const char *distribution)
+{
+    int range = n > 200 ? n : 200;
+    int i;
+
+    if (strcmp(distribution, "few") == 0)
+    {
+        for (i = 0; i < n; i++)
+            arr[i] = rand() % 8 + 1;
+    }
+    else if (strcmp(distribution, "sorted") == 0 || strcmp(distribution, "nearly") == 0)
+    {
+        for (i = 0; i < n; i++)
+            arr[i] = (int) ((long long) i * range / n) + 1;
+
+        // Algumas trocas aleatórias (cerca de 1% das posições)
+        if (strcmp(distribution, "nearly") == 0)
+            for (i = 0; i < n / 100 + 1; i++)
+            {
+                int a = rand() % n, b = rand() % n;
+                int tmp = arr[a];
+                arr[a] = arr[b];
+                arr[b] = tmp;
+            }
+    }
+    else if (strcmp(distribution, "reversed") == 0)
+    {
+        for (i = 0; i < n; i++)
+            arr[i] = (int) ((long long) (n - i) * range / n);
+    }
+    else
+    {
+        for (i = 0; i < n; i++)
+            arr[i] = rand() % range + 1;
+    }
+}
+
+// Lê tamanho, semente e distribuição da linha de comando e preenche o array
+int *setup_input(int argc, char *argv[], int *size)
+{
+    const char *distribution = argc > 3 ? argv[3] : "random";
+    int *arr;
+
+    if (argc > 1 && atoi(argv[1]) > 0)
+        *size = atoi(argv[1]);
+
+    srand(argc > 2 ? (unsigned) atoi(argv[2]) : (unsigned) time(NULL));
+
+    stats_mode = getenv("SORT_STATS") != NULL;
+
+    arr = malloc(*size * sizeof(int));
+    fill_array(arr, *size, distribution);
+
+    timespec_get(&stat_start, TIME_UTC);
+    return arr;
+}
+
+void report_stats(void)
+{
+    struct timespec end;
+    double seconds;
+
+    if (!stats_mode)
+        return;
+
+    timespec_get(&end, TIME_UTC);
+    seconds = (end.tv_sec - stat_start.tv_sec) + (end.tv_nsec - stat_start.tv_nsec) / 1e9;
+
+    fprintf(stderr, "comparisons=%lld swaps=%lld writes=%lld seconds=%.9f\n",
+            stat_comparisons, stat_swaps, stat_writes, seconds);
+}
+
+#endif
@@ -0,0 +1,85 @@
+/*
+    Passos com faixa por worker para os produtores paralelos.
+
+    Cada linha do stdout tem o formato
+        worker timestamp left right | v1 v2 ... vn
+    onde timestamp é um relógio lógico global e [left, right] é o trecho do
+    array que o worker acabou de processar.
+
+    Fora do modo de estatísticas cada operação (merge ou partição) roda com
+    trace_lock travado, para que o snapshot emitido seja consistente; com
+    SORT_STATS os workers rodam livres e contam em contadores próprios.
+
+    Número de threads: quarto argumento da linha de comando (padrão 4).
+*/
+
+#ifndef TRACE_LANES_H
+#define TRACE_LANES_H
+
+#include <pthread.h>
+#include <stdio.h>
+#include <stdlib.h>
+
+#define MAX_WORKERS 64
+#define DEFAULT_THREADS 4
+
+// Contadores por worker: cada entrada ocupa uma linha de cache própria (64
+// bytes, alinhada), para evitar falso compartilhamento entre os workers
+typedef struct __attribute__((aligned(64)))
+{
+    long long comparisons;
+    long long swaps;
+    long long writes;
+} WorkerStats;
+
+WorkerStats worker_stats[MAX_WORKERS];
+
+static pthread_mutex_t trace_lock = PTHREAD_MUTEX_INITIALIZER;
+static long long trace_clock = 0;
+
+int read_thread_count(int argc, char *argv[])
+{
+    int threads = argc > 4 ? atoi(argv[4]) : DEFAULT_THREADS;
+
+    if (threads < 1)
+        threads = 1;
+    if (threads > MAX_WORKERS)
+        threads = MAX_WORKERS;
+
+    return threads;
+}
+
+void lane_begin(void)
+{
+    if (!stats_mode)
+        pthread_mutex_lock(&trace_lock);
+}
+
+void lane_end(int arr[], int n, int worker, int left, int right)
+{
+    int i;
+
+    if (stats_mode)
+        return;
+
+    printf("%d %lld %d %d |", worker, trace_clock++, left, right);
+    for (i = 0; i < n; i++)
+        printf(" %d", arr[i]);
+    printf("\n");
+
+    pthread_mutex_unlock(&trace_lock);
+}
+
+void collect_worker_stats(int workers)
+{
+    int i;
+
+    for (i = 0; i < workers; i++)
+    {
+        stat_comparisons += worker_stats[i].comparisons;
+        stat_swaps += worker_stats[i].swaps;
+        stat_writes += worker_stats[i].writes;
+    }
+}
+
+#endif
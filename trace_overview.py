@@ -0,0 +1,129 @@
+"""Visão geral do trace (passo x índice) para navegação na linha do tempo
+
+Cada coluna da imagem agrupa um intervalo de passos e cada linha um intervalo
+de índices do array. As somas são acumuladas incrementalmente: quando o trace
+cresce além da largura, colunas vizinhas são fundidas e o intervalo dobra.
+"""
+import numpy as np
+
+
+class TraceOverview:
+    def __init__(self, width=1024, rows=48, mode="value"):
+        self.width = width
+        self.rows = rows
+        self.mode = mode  # "value" (valor médio) ou "changes" (densidade de mudanças)
+        self.reset()
+
+    def reset(self):
+        self.total_steps = 0
+        self.steps_per_column = 1
+        self.row_starts = None
+        self.sums = None
+        self.counts = np.zeros(self.width, dtype=np.int64)
+        self.last_step = None
+        self.max_value = 1
+        self.version = 0
+
+    @classmethod
+    def from_steps(cls, steps, **kwargs):
+        """Constrói a visão geral de um trace completo"""
+        overview = cls(**kwargs)
+        overview.extend(steps)
+        return overview
+
+    def _grow(self, needed):
+        """Funde pares de colunas até caberem `needed` passos"""
+        while needed > self.width * self.steps_per_column:
+            half = self.width // 2
+            self.sums[:half] = self.sums[0::2] + self.sums[1::2]
+            self.sums[half:] = 0
+            self.counts[:half] = self.counts[0::2] + self.counts[1::2]
+            self.counts[half:] = 0
+            self.steps_per_column *= 2
+
+    def _sum_by_column(self, per_step, start):
+        """Soma os passos por coluna: início e fim parciais, meio via reshape"""
+        spc = self.steps_per_column
+        n = per_step.shape[1]
+        head = min(len(per_step), -start % spc)
+        body = (len(per_step) - head) // spc * spc
+
+        columns, values, counts = [], [], []
+        if head:
+            columns.append([start // spc])
+            values.append(per_step[:head].sum(axis=0, dtype=np.int64)[None, :])
+            counts.append([head])
+        if body:
+            first_column = (start + head) // spc
+            columns.append(np.arange(first_column, first_column + body // spc))
+            values.append(per_step[head:head + body].reshape(-1, spc, n).sum(axis=1, dtype=np.int64))
+            counts.append(np.full(body // spc, spc))
+        tail = len(per_step) - head - body
+        if tail:
+            columns.append([(start + head + body) // spc])
+            values.append(per_step[head + body:].sum(axis=0, dtype=np.int64)[None, :])
+            counts.append([tail])
+
+        return np.concatenate(columns), np.concatenate(values), np.concatenate(counts)
+
+    def extend(self, block):
+        """Acrescenta passos (matriz passos x n) ao final do trace"""
+        block = np.asarray(block)
+        if block.ndim != 2 or len(block) == 0:
+            return
+
+        if self.sums is None:
+            n = block.shape[1]
+            self.row_starts = np.unique(np.arange(min(self.rows, n)) * n // min(self.rows, n))
+            self.sums = np.zeros((self.width, len(self.row_starts)), dtype=np.float64)
+
+        if self.mode == "changes":
+            per_step = np.empty(block.shape, dtype=bool)
+            per_step[0] = False if self.last_step is None else block[0] != self.last_step
+            np.not_equal(block[1:], block[:-1], out=per_step[1:])
+        else:
+            per_step = block
+            self.max_value = max(self.max_value, int(block.max()))
+
+        start = self.total_steps
+        self._grow(start + len(block))
+
+        # Reduzir primeiro os passos (coluna a coluna) e depois os índices,
+        # assim a segunda redução já opera sobre poucas linhas
+        columns, column_values, column_counts = self._sum_by_column(per_step, start)
+        self.sums[columns] += np.add.reduceat(column_values, self.row_starts, axis=1)
+        self.counts[columns] += column_counts
+
+        self.total_steps += len(block)
+        self.last_step = block[-1].copy()
+        self.version += 1
+
+    @property
+    def columns_used(self):
+        return max(1, -(-self.total_steps // self.steps_per_column))
+
+    def intensity(self):
+        """Matriz (linhas x colunas usadas) normalizada entre 0 e 1"""
+        if self.sums is None:
+            return np.zeros((1, 1))
+        used = self.columns_used
+        row_sizes = np.diff(np.r_[self.row_starts, self.last_step.shape[0]])
+        counts = np.maximum(self.counts[:used], 1)[:, None]
+        means = self.sums[:used] / (counts * row_sizes[None, :])
+        if self.mode == "changes":
+            peak = means.max()
+            return (means / peak if peak > 0 else means).T
+        return (means / self.max_value).T
+
+    def image(self):
+        """Imagem RGB uint8 com o mesmo gradiente roxo → laranja das barras"""
+        factor = np.clip(self.intensity(), 0.0, 1.0)
+        rgb = np.stack([0.5 + 0.5 * factor, 0.5 * factor, 0.5 - 0.5 * factor], axis=-1)
+        return np.ascontiguousarray((rgb * 255).astype(np.uint8))
+
+    def step_at(self, fraction):
+        """Converte uma posição horizontal (0 a 1) no passo correspondente"""
+        if self.total_steps == 0:
+            return 0
+        fraction = min(1.0, max(0.0, fraction))
+        return min(self.total_steps - 1, int(fraction * self.total_steps))
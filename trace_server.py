@@ -0,0 +1,305 @@
+"""Servidor local de traces: executa e decodifica cada trace uma única vez
+
+Os produtores rodam no servidor (pelo ring em memória compartilhada) e os
+passos são guardados já codificados em frames binários. Qualquer número de
+visualizadores pode se conectar e receber os mesmos frames, cada um no seu
+ritmo (controle de fluxo por cliente via drain). Traces completos ficam em
+cache no disco, no formato de trace_store.py.
+
+Protocolo: o cliente envia uma linha JSON
+    {"algorithm": "merge", "size": 50, "distribution": "random", "seed": 1}
+(seed opcional: sem ela o cliente se anexa ao trace mais recente daquela
+combinação) e recebe uma linha JSON de cabeçalho seguida de frames
+    <primeiro passo uint32><quantidade uint32><quantidade x n int32>
+terminados por um frame com quantidade 0. Se o produtor falhar depois do
+cabeçalho, a conexão é fechada sem esse frame final.
+
+Traces completos sem clientes conectados são descartados da memória (os menos
+usados primeiro) quando o total passa de --memory-mb; continuam no cache em disco.
+
+Uso: python trace_server.py [--address /tmp/sort_trace_server.sock | 127.0.0.1:8765] [--cache trace_cache]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import struct
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from producers import ALGORITHMS, DISTRIBUTIONS, producer_command, producer_path
+from shm_ring import stream_steps
+from trace_store import load_trace_file, save_trace, trace_name
+
+FRAME = struct.Struct("<II")
+MAX_FRAME_BYTES = 256 * 1024
+DEFAULT_SIZE = 50
+DEFAULT_MEMORY_MB = 512
+
+if hasattr(socket, "AF_UNIX"):
+    DEFAULT_ADDRESS = "/tmp/sort_trace_server.sock"
+else:
+    DEFAULT_ADDRESS = "127.0.0.1:8765"
+
+
+def parse_address(address):
+    """'host:porta' para TCP, qualquer outra coisa é o caminho de um socket Unix"""
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+class Trace:
+    """Um trace em produção ou completo, com os frames já codificados"""
+
+    def __init__(self, algorithm, size, distribution, seed):
+        self.algorithm = algorithm
+        self.size = size
+        self.distribution = distribution
+        self.seed = seed
+        self.n = None
+        self.frames = []
+        self.total = 0
+        self.nbytes = 0
+        self.done = False
+        self.error = None
+        self.clients = 0
+        self.updated = asyncio.Event()
+
+    def append(self, block):
+        """Codifica um bloco de passos em frames (chamado uma vez por bloco)"""
+        self.n = block.shape[1]
+        rows_per_frame = max(1, MAX_FRAME_BYTES // (4 * self.n))
+        for start in range(0, len(block), rows_per_frame):
+            chunk = np.ascontiguousarray(block[start:start + rows_per_frame], dtype=np.int32)
+            self.frames.append(FRAME.pack(self.total, len(chunk)) + chunk.tobytes())
+            self.total += len(chunk)
+            self.nbytes += len(self.frames[-1])
+        self._notify()
+
+    def finish(self, error=None):
+        self.error = error
+        self.done = True
+        self._notify()
+
+    def _notify(self):
+        self.updated.set()
+        self.updated = asyncio.Event()
+
+    def steps(self):
+        """Matriz (passos x n) reconstruída a partir dos frames"""
+        payload = b"".join(frame[FRAME.size:] for frame in self.frames)
+        return np.frombuffer(payload, dtype=np.int32).reshape(-1, self.n)
+
+
+class TraceServer:
+    def __init__(self, cache_dir, memory_limit=DEFAULT_MEMORY_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.memory_limit = memory_limit
+        # Ordem de uso: o trace menos usado recentemente fica no início
+        self.traces = OrderedDict()
+        # Semente do trace mais recente de cada combinação (pedidos sem seed)
+        self.latest = {}
+
+    def get_trace(self, request):
+        """Retorna o trace pedido, reaproveitando memória, cache em disco ou produtor"""
+        algorithm = request.get("algorithm")
+        size = int(request.get("size") or DEFAULT_SIZE)
+        distribution = request.get("distribution") or "random"
+        if algorithm not in ALGORITHMS or distribution not in DISTRIBUTIONS:
+            raise ValueError(f"pedido inválido: {request}")
+
+        seed = request.get("seed")
+        if seed is None:
+            seed = self.latest.get((algorithm, size, distribution), int(time.time()))
+
+        key = (algorithm, size, distribution, int(seed))
+        trace = self.traces.get(key)
+        if trace is not None:
+            self.traces.move_to_end(key)
+        else:
+            trace = Trace(*key)
+            cache_path = os.path.join(self.cache_dir, trace_name(*key))
+            if os.path.exists(cache_path):
+                # Se o arquivo estiver corrompido a exceção sobe antes do
+                # trace ser registrado, e o próximo pedido tenta de novo
+                steps, _ = load_trace_file(cache_path)
+                trace.append(steps)
+                trace.finish()
+                print(f"Trace {trace_name(*key)} carregado do cache")
+            else:
+                asyncio.get_running_loop().create_task(self.produce(trace, cache_path))
+            self.traces[key] = trace
+        self.latest[algorithm, size, distribution] = key[3]
+        return trace
+
+    def evict(self):
+        """Descarta os traces menos usados até caber no limite de memória
+
+        Só saem traces completos e sem clientes; um novo pedido os recarrega do
+        cache em disco.
+        """
+        used = sum(trace.nbytes for trace in self.traces.values())
+        for key, trace in list(self.traces.items()):
+            if used <= self.memory_limit:
+                break
+            if trace.done and trace.clients == 0:
+                del self.traces[key]
+                used -= trace.nbytes
+
+    async def produce(self, trace, cache_path):
+        """Executa o produtor uma única vez, repassando os blocos ao loop"""
+        loop = asyncio.get_running_loop()
+        command = producer_command(trace.algorithm, trace.size, trace.seed, trace.distribution)
+        start = time.perf_counter()
+
+        def run():
+            # Roda numa thread: copia cada bloco do ring antes de liberá-lo.
+            # stream_steps falha se o produtor terminar com erro, e então o
+            # trace truncado não é marcado como completo nem gravado no cache
+            for block in stream_steps(command):
+                loop.call_soon_threadsafe(trace.append, block.copy())
+
+        try:
+            if not os.path.exists(producer_path(trace.algorithm)):
+                raise FileNotFoundError(f"{producer_path(trace.algorithm)} não encontrado")
+            await loop.run_in_executor(None, run)
+            # Garante que os blocos agendados já foram anexados
+            await asyncio.sleep(0)
+            if trace.total == 0:
+                raise RuntimeError("o produtor não emitiu nenhum passo")
+        except Exception as e:
+            print(f"Erro ao produzir {os.path.basename(cache_path)}: {e}")
+            trace.finish(str(e))
+            # Um trace com erro não fica em memória: o próximo pedido tenta de novo
+            self.traces.pop((trace.algorithm, trace.size, trace.distribution, trace.seed), None)
+            if self.latest.get((trace.algorithm, trace.size, trace.distribution)) == trace.seed:
+                del self.latest[trace.algorithm, trace.size, trace.distribution]
+            return
+
+        trace.finish()
+        print(f"Trace {os.path.basename(cache_path)}: {trace.total} passos em {time.perf_counter() - start:.2f} s")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        await loop.run_in_executor(None, save_trace, cache_path, trace.steps())
+        self.evict()
+
+    async def handle_client(self, reader, writer):
+        trace = None
+        try:
+            try:
+                trace = self.get_trace(json.loads(await reader.readline()))
+            except Exception as e:
+                # Pedido inválido ou cache ilegível: o cliente recebe o erro no cabeçalho
+                print(f"Erro ao atender pedido: {e}")
+                writer.write((json.dumps({"error": str(e)}) + "\n").encode())
+                await writer.drain()
+                return
+
+            trace.clients += 1
+            self.evict()
+            while trace.n is None and not trace.done:
+                await trace.updated.wait()
+
+            header = {"algorithm": trace.algorithm, "size": trace.size, "distribution": trace.distribution,
+                      "seed": trace.seed, "n": trace.n, "error": trace.error}
+            writer.write((json.dumps(header) + "\n").encode())
+
+            sent = 0
+            while True:
+                # drain() por frame: um cliente lento só atrasa a si mesmo
+                while sent < len(trace.frames):
+                    writer.write(trace.frames[sent])
+                    sent += 1
+                    await writer.drain()
+                if trace.done:
+                    break
+                await trace.updated.wait()
+
+            # Produtor falhou no meio: sem o frame final o cliente não toma o
+            # trace truncado por completo
+            if trace.error:
+                return
+            writer.write(FRAME.pack(trace.total, 0))
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if trace is not None:
+                trace.clients -= 1
+                self.evict()
+            writer.close()
+
+    async def serve(self, address):
+        address = parse_address(address)
+        if isinstance(address, tuple):
+            server = await asyncio.start_server(self.handle_client, *address)
+        else:
+            if os.path.exists(address):
+                os.unlink(address)
+            server = await asyncio.start_unix_server(self.handle_client, address)
+        print(f"Servidor de traces em {address}")
+        async with server:
+            await server.serve_forever()
+
+
+def iter_trace(address, algorithm, size=None, distribution=None, seed=None):
+    """Cliente: pede um trace ao servidor e gera os blocos (passos x n) à medida que chegam"""
+    address = parse_address(address)
+    if isinstance(address, tuple):
+        connection = socket.create_connection(address)
+    else:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(address)
+
+    request = {"algorithm": algorithm, "size": size, "distribution": distribution, "seed": seed}
+    with connection, connection.makefile("rb") as stream:
+        connection.sendall((json.dumps(request) + "\n").encode())
+        line = stream.readline()
+        if not line.endswith(b"\n"):
+            raise ConnectionError("conexão encerrada antes do cabeçalho")
+        header = json.loads(line)
+        if header.get("error"):
+            raise RuntimeError(header["error"])
+
+        n = header["n"]
+        while True:
+            frame = stream.read(FRAME.size)
+            if len(frame) != FRAME.size:
+                raise ConnectionError("conexão encerrada antes do fim do trace")
+            first, count = FRAME.unpack(frame)
+            if count == 0:
+                break
+            payload = stream.read(count * n * 4)
+            if len(payload) != count * n * 4:
+                raise ConnectionError("conexão encerrada no meio de um frame")
+            yield np.frombuffer(payload, dtype=np.int32).reshape(count, n)
+
+
+def fetch_trace(address, algorithm, size=None, distribution=None, seed=None):
+    """Cliente: pede um trace ao servidor e retorna a matriz (passos x n) completa"""
+    blocks = list(iter_trace(address, algorithm, size, distribution, seed))
+    if not blocks:
+        return np.empty((0, 0), dtype=np.int32)
+    return np.concatenate(blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de traces para vários visualizadores")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help="caminho do socket Unix ou host:porta")
+    parser.add_argument("--cache", default="trace_cache", help="diretório de cache dos traces completos")
+    parser.add_argument("--memory-mb", type=int, default=DEFAULT_MEMORY_MB,
+                        help="memória máxima para traces completos sem clientes")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(TraceServer(args.cache, args.memory_mb * 1024 * 1024).serve(args.address))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
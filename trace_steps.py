@@ -0,0 +1,97 @@
+"""Passos do trace em memória para a reprodução
+
+Os passos ficam numa matriz int32 (passos x n) que cresce por blocos. As
+posições alteradas em cada passo são calculadas uma única vez por bloco, com
+a diferença entre passos consecutivos, para que a reprodução (malha de barras
+e sons) trabalhe só com o que mudou em vez de comparar o array inteiro.
+"""
+import numpy as np
+
+
+def _reserve(array, needed):
+    """Dobra a capacidade (primeira dimensão) do array até caber `needed`"""
+    if needed <= len(array):
+        return array
+    capacity = max(needed, 2 * len(array))
+    grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class TraceSteps:
+    def __init__(self):
+        self.count = 0
+        self.values = None
+        self.owners = None  # worker dono de cada posição (produtores paralelos)
+        self.max_value = 1
+        # Posições alteradas de todos os passos, concatenadas: as do passo i
+        # ficam em positions[offsets[i]:offsets[i + 1]]
+        self.positions = np.empty(0, dtype=np.int32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+
+    @classmethod
+    def from_steps(cls, steps, owners=None):
+        """Monta o trace a partir de uma matriz ou lista de passos completa"""
+        trace = cls()
+        trace.extend(steps, owners)
+        return trace
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """Passo (ou fatia de passos) como view da matriz, sem cópia"""
+        return self.values[:self.count][index]
+
+    def owner_row(self, index):
+        if self.owners is None:
+            return None
+        return self.owners[:self.count][index]
+
+    def changes(self, index):
+        """Posições que mudaram (valor ou dono) do passo index - 1 para index"""
+        return self.positions[self.offsets[index]:self.offsets[index + 1]]
+
+    def is_sorted(self, index):
+        row = self[index]
+        return bool(np.all(row[:-1] <= row[1:]))
+
+    def extend(self, block, owners=None):
+        """Acrescenta passos (matriz passos x n) ao final do trace"""
+        block = np.asarray(block, dtype=np.int32)
+        if block.ndim != 2 or len(block) == 0:
+            return
+        if owners is not None:
+            owners = np.asarray(owners, dtype=np.int16)
+
+        if self.values is None:
+            self.values = np.empty((0, block.shape[1]), dtype=np.int32)
+            if owners is not None:
+                self.owners = np.empty((0, block.shape[1]), dtype=np.int16)
+
+        # Mudanças de cada passo em relação ao anterior (o primeiro passo do
+        # trace não tem anterior)
+        changed = np.empty(block.shape, dtype=bool)
+        changed[0] = block[0] != self.values[self.count - 1] if self.count else False
+        np.not_equal(block[1:], block[:-1], out=changed[1:])
+        if self.owners is not None:
+            if self.count:
+                changed[0] |= owners[0] != self.owners[self.count - 1]
+            changed[1:] |= owners[1:] != owners[:-1]
+
+        rows, columns = np.nonzero(changed)
+        start = self.offsets[self.count]
+        self.positions = _reserve(self.positions, start + len(columns))
+        self.positions[start:start + len(columns)] = columns
+        self.offsets = _reserve(self.offsets, self.count + len(block) + 1)
+        self.offsets[self.count + 1:self.count + len(block) + 1] = \
+            start + np.cumsum(np.bincount(rows, minlength=len(block)))
+
+        self.values = _reserve(self.values, self.count + len(block))
+        self.values[self.count:self.count + len(block)] = block
+        if self.owners is not None:
+            self.owners = _reserve(self.owners, self.count + len(block))
+            self.owners[self.count:self.count + len(block)] = owners
+
+        self.max_value = max(self.max_value, int(block.max()))
+        self.count += len(block)
@@ -0,0 +1,52 @@
+"""Armazenamento de traces em disco
+
+Cada trace é um .npz com a matriz `steps` (passos x n, int32) e, para os
+produtores paralelos, `lanes` (worker, timestamp, left, right por passo).
+Um manifest.json no mesmo diretório descreve todos os traces gerados.
+"""
+import json
+import os
+
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+
+
+def trace_name(algorithm, size, distribution, seed):
+    return f"{algorithm}_n{size}_{distribution}_s{seed}.npz"
+
+
+def save_trace(path, steps, lanes=None):
+    """Grava o trace de forma atômica (arquivo temporário + rename)"""
+    arrays = {'steps': np.asarray(steps, dtype=np.int32)}
+    if lanes is not None:
+        arrays['lanes'] = np.asarray(lanes, dtype=np.int64)
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as trace_file:
+        np.savez(trace_file, **arrays)
+    os.replace(temporary, path)
+
+
+def load_trace_file(path):
+    """Retorna (steps, lanes), com lanes None para traces sequenciais"""
+    with np.load(path) as data:
+        steps = data['steps']
+        lanes = data['lanes'] if 'lanes' in data.files else None
+    return steps, lanes
+
+
+def write_manifest(directory, entries, **metadata):
+    manifest = {**metadata, 'traces': entries}
+    temporary = os.path.join(directory, MANIFEST_NAME + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(temporary, os.path.join(directory, MANIFEST_NAME))
+
+
+def read_manifest(directory):
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as manifest_file:
+        return json.load(manifest_file)